@@ -6,19 +6,43 @@ filtering, conversion, layouting and I/O capabilities.
 
 """
 
+import importlib as _importlib
+
+
 __all__ = [
     'convert',
     'create',
     'export',
     'filter',
+    'ifilter',
     'inspect',
     'layout',
+    'layout_many',
     'load',
     'plot',
+    'plot_many',
     'store',
 ]
 
 __version__ = '0.1.1'
 
 
-from ._internal import convert, create, export, filter, inspect, layout, load, plot, store
+def __getattr__(name):
+    """Import the public functions lazily on first access (PEP 562).
+
+    This keeps ``import mevis`` cheap, e.g. for the command line interface,
+    because OpenCog, NetworkX and gravis are only loaded when needed.
+
+    """
+    if name == '_internal':
+        return _importlib.import_module('._internal', __name__)
+    if name in __all__:
+        module = _importlib.import_module('._internal', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
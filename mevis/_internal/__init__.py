@@ -1,8 +1,43 @@
 """This is a subpackage used to hide all implementation details from the user."""
 
-from .conversion import convert
-from .filtering import filter
-from .inspection import inspect
-from .io import create, export, load, store
-from .layouting import layout
-from .plotting import plot
+import importlib as _importlib
+
+
+# Public function name => submodule that implements it, imported lazily on first access
+_LOCATIONS = {
+    'convert': 'conversion',
+    'create': 'io',
+    'export': 'io',
+    'filter': 'filtering',
+    'ifilter': 'filtering',
+    'inspect': 'inspection',
+    'layout': 'layouting',
+    'layout_many': 'layouting',
+    'load': 'io',
+    'plot': 'plotting',
+    'plot_many': 'plotting',
+    'store': 'io',
+}
+
+
+_SUBMODULES = (
+    'args', 'cli', 'conversion', 'filtering', 'inspection', 'io', 'layouting', 'plotting')
+
+
+def __getattr__(name):
+    """Import only the submodule that provides the requested function (PEP 562)."""
+    if name in _SUBMODULES:
+        return _importlib.import_module('.' + name, __name__)
+    try:
+        module_name = _LOCATIONS[name]
+    except KeyError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name)) from None
+    module = _importlib.import_module('.' + module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LOCATIONS))
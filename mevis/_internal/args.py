@@ -41,3 +41,28 @@ def check_arg(value, name, allowed_types=None, allowed_values=None, allow_none=F
             message = 'Argument "{}" has a wrong value: {}\n\nAllowed values: {}'.format(
                 name, value, allowed_value_names)
             raise ValueError(message)
+
+
+def check_args(values, spec):
+    """Check several user-provided arguments against a table of rules.
+
+    Parameters
+    ----------
+    values : tuple of any type
+        Values that a user provided for the arguments, in the order of ``spec``.
+    spec : tuple of tuples
+        One ``(name, allowed_types, allowed_values, allow_none)`` rule per argument,
+        with the same meaning as in :func:`check_arg`.
+
+    Note
+    ----
+    Valid arguments only cost an ``isinstance`` call and an optional membership test.
+    Only an invalid argument is passed to :func:`check_arg`, which raises the error.
+
+    """
+    for value, (name, allowed_types, allowed_values, allow_none) in zip(values, spec):
+        if allow_none and value is None:
+            continue
+        if not isinstance(value, allowed_types) or (
+                allowed_values is not None and value not in allowed_values):
+            check_arg(value, name, allowed_types, allowed_values, allow_none)
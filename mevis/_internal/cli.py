@@ -1,20 +1,103 @@
 import argparse
 import ast
+import functools
 import os
+import re
 import sys
 
-from .conversion import convert as _convert
-from .filtering import FILTER_CONTEXTS as _FILTER_CONTEXTS
-from .filtering import filter as _filter
-from .io import export as _export
-from .io import load as _load
-from .layouting import LAYOUT_METHODS as _LAYOUT_METHODS
-from .layouting import layout as _layout
-from .plotting import plot as _plot
 
-
-def parse():
+# The modules that import OpenCog, NetworkX and gravis are loaded only when an action is
+# performed, so that the values below are repeated here and mevis -h responds quickly
+_KNOWN_FORMATS = ('.html', '.jpg', '.png', '.svg', '.gml', '.gml.gz', '.gml.bz2')
+_BACKENDS = ('d3', 'vis', 'three')
+_FILTER_MODES = ('include', 'exclude')
+_FILTER_CONTEXTS = ('atom', 'in', 'out', 'both', 'in-tree', 'out-tree')
+_LAYOUT_METHODS = (
+    'dot', 'neato', 'twopi', 'circo', 'fdp', 'sfdp',
+    'bipartite', 'circular', 'kamada_kawai', 'planar', 'random', 'shell', 'spring',
+    'spectral', 'spiral', 'spring_lbfgs')
+# Sets for O(1) membership tests, the tuples above keep the order for help and error messages
+_BACKEND_CHOICES = frozenset(_BACKENDS)
+_FILTER_MODE_CHOICES = frozenset(_FILTER_MODES)
+_LAYOUT_CHOICES = frozenset(_LAYOUT_METHODS)
+_CONTEXT_PATTERN = re.compile(r"""\(\s*(['"])(in|out|both)\1\s*,\s*(\d+)\s*,?\s*\)""")
+_literal_eval = ast.literal_eval
+_LAYOUT_HELP = 'layout method to calculate node coordinates\n' + '\n'.join(
+    '- "{}"'.format(method) for method in _LAYOUT_METHODS)
+_TARGET_HELP = (
+    'path of output file, with following cases'
+    '\n- none     create plot and display it in webbrowser'
+    '\n- .html    create plot and export it to a HTML file'
+    '\n- .jpg     create plot and export it to a JPG file'
+    '\n- .png     create plot and export it to a PNG file'
+    '\n- .svg     create plot and export it to a SVG file'
+    '\n           works only with backend d3'
+    '\n- .gml     create graph and export it to GML file'
+    '\n- .gml.gz  same but file is compressed with gzip'
+    '\n- .gml.bz2 same but file is compressed with bzip2')
+_FC_HELP = (
+    'filter context to expaned selected atoms to'
+    '\n- "atom" = selected Atoms'
+    '\n- "in" = selection + incoming neighbors'
+    '\n- "out" = selection + outgoing neighbors'
+    '\n- "both" = selection + incoming and outgoing'
+    '\n  neighbors'
+    '\n- "in-tree" = selection + repeated incoming'
+    '\n  neighbors'
+    '\n- "out-tree" = selection + repeated outgoing'
+    '\n  neighbors'
+    '''\n- "('in', n)" = selection + incoming neighbors'''
+    '\n  within distance n'
+    '''\n- "('out', n)" = selection + outgoing neighbors'''
+    '\n  within distance n'
+    '''\n- "('both', n)" = selection + incoming and outgoing'''
+    '\n  neighbors within distance n')
+
+
+def parse(argv=None):
     """Serve as CLI entry point by parsing arguments and calling corresponding functions."""
+    # Parse: fast path for common arguments, argparse for help, errors and unusual input
+    if argv is None:
+        argv = sys.argv[1:]
+    args = fast_parse(argv)
+    if args is None:
+        # --kwargs is consumed beforehand, because argparse scans many entries slowly
+        argv, kwargs_entries = split_kwargs(argv)
+        args = get_parser().parse_args(argv, namespace=CliNamespace())
+        if kwargs_entries is not None:
+            args.kwargs = parse_kwargs(kwargs_entries)
+    source = args.i
+    target = args.o
+    overwrite = args.force
+
+    # Collect
+    filter_options = FilterOptions(try_eval(args.ft), args.fc, args.fm)
+    convert_options = ConvertOptions(
+        not args.gua, not args.gud, *[try_eval(getattr(args, flag)) for flag in _CONVERT_FLAGS])
+    kwargs = dict() if args.kwargs is None else args.kwargs
+
+    # Mutually dependent checks
+    if (not overwrite) and (target is not None) and os.path.exists(target):
+        sys.tracebacklimit = 0
+        message = (
+            'The provided output_filepath "{}" already exists. '
+            'You can use --force to overwrite it.'.format(target))
+        raise argparse.ArgumentTypeError(message) from None
+
+    # Perform the actions required by the arguments
+    perform_it(
+        source, target, overwrite, args.verbose, args.b, args.l, args.cd, filter_options,
+        convert_options, kwargs)
+
+
+@functools.lru_cache(maxsize=1)
+def get_parser():
+    """Return the argparse parser, which is built on first use and reused afterwards."""
+    return build_parser()
+
+
+def build_parser():
+    """Create the full argparse parser, which is also used to show help and report errors."""
     # Create parser
     parser = argparse.ArgumentParser(
         description='Visualize an OpenCog Atomspace as graph with two kinds of vertices.',
@@ -33,16 +116,7 @@ def parse():
         metavar='output_filepath',
         required=False,
         type=validate_target,
-        help=('path of output file, with following cases'
-              '\n- none     create plot and display it in webbrowser'
-              '\n- .html    create plot and export it to a HTML file'
-              '\n- .jpg     create plot and export it to a JPG file'
-              '\n- .png     create plot and export it to a PNG file'
-              '\n- .svg     create plot and export it to a SVG file'
-              '\n           works only with backend d3'
-              '\n- .gml     create graph and export it to GML file'
-              '\n- .gml.gz  same but file is compressed with gzip'
-              '\n- .gml.bz2 same but file is compressed with bzip2'))
+        help=_TARGET_HELP)
 
     parser.add_argument(
         '-f',
@@ -60,8 +134,8 @@ def parse():
         '-b',
         metavar='backend',
         required=False,
-        type=str,
-        choices=('d3', 'vis', 'three'),
+        type=sys.intern,
+        choices=_BACKENDS,
         default='vis',
         help='backend library for graph visualization'
              '\n"d3" = d3.js'
@@ -72,10 +146,9 @@ def parse():
         '-l',
         metavar='layout_method',
         required=False,
-        type=str,
+        type=sys.intern,
         choices=_LAYOUT_METHODS,
-        help='layout method to calculate node coordinates\n{}'.format(
-            '\n'.join('- "{}"'.format(method) for method in _LAYOUT_METHODS)))
+        help=_LAYOUT_HELP)
 
     parser.add_argument(
         '-cd',
@@ -100,29 +173,13 @@ def parse():
         required=False,
         type=validate_context,
         default='atom',
-        help='filter context to expaned selected atoms to'
-             '\n- "atom" = selected Atoms'
-             '\n- "in" = selection + incoming neighbors'
-             '\n- "out" = selection + outgoing neighbors'
-             '\n- "both" = selection + incoming and outgoing'
-             '\n  neighbors'
-             '\n- "in-tree" = selection + repeated incoming'
-             '\n  neighbors'
-             '\n- "out-tree" = selection + repeated outgoing'
-             '\n  neighbors'
-             '''\n- "('in', n)" = selection + incoming neighbors'''
-             '\n  within distance n'''
-             '''\n- "('out', n)" = selection + outgoing neighbors'''
-             '\n  within distance n'''
-             '''\n- "('both', n)" = selection + incoming and outgoing'''
-             '\n  neighbors within distance n')
-
+        help=_FC_HELP)
     parser.add_argument(
         '-fm',
         metavar='filter_mode',
         required=False,
-        type=str,
-        choices=('include', 'exclude'),
+        type=sys.intern,
+        choices=_FILTER_MODES,
         default='include',
         help='filter mode deciding how to use the selection'
              '\n- "include" = include selected Atoms to output'
@@ -180,108 +237,188 @@ def parse():
     parser.add_argument(
         '--kwargs', help='optional keyword arguments forwarded to plot function', nargs='*',
         action=KwargsParser)
+    return parser
+
+
+# Short CLI flags of the annotation arguments in the order of the convert function
+_CONVERT_FLAGS = (
+    'nl', 'nc', 'no', 'ns', 'nsh', 'nbc', 'nbs', 'nlc', 'nls', 'nh', 'ncl', 'ni', 'np',
+    'el', 'ec', 'eo', 'es', 'elc', 'els', 'eh', 'ecl')
+
+# Fast path of the parser: flag => (attribute name, kind of argument)
+_FLAGS = {
+    '-i': ('i', 'value'),
+    '-o': ('o', 'value'),
+    '-f': ('force', 'flag'),
+    '--force': ('force', 'flag'),
+    '-v': ('verbose', 'flag'),
+    '--verbose': ('verbose', 'flag'),
+    '-b': ('b', 'value'),
+    '-l': ('l', 'value'),
+    '-cd': ('cd', 'value'),
+    '-ft': ('ft', 'value'),
+    '-fc': ('fc', 'value'),
+    '-fm': ('fm', 'value'),
+    '-gua': ('gua', 'flag'),
+    '-gud': ('gud', 'flag'),
+}
+_FLAGS.update(('-' + name, (name, 'value')) for name in _CONVERT_FLAGS)
+_DEFAULTS = {name: False if kind == 'flag' else None for name, kind in _FLAGS.values()}
+_DEFAULTS.update(b='vis', cd=3.5, fc='atom', fm='include', kwargs=None)
+
+
+def fast_parse(argv):
+    """Parse the arguments in a single pass without building the argparse parser.
+
+    Returns ``None`` if anything unusual is encountered, e.g. a request for help,
+    an unknown flag or an invalid value, so that the caller can fall back to
+    argparse, which then shows help or reports the error in the usual way.
 
-    # Parse
-    args = parser.parse_args()
-    source = args.i
-    target = args.o
-    backend = args.b
-    layout = args.l
-    capture_delay = args.cd
-    overwrite = args.force
-    verbose = args.verbose
-
-    filter_target = try_eval(args.ft)
-    filter_context = args.fc
-    filter_mode = args.fm
-
-    graph_annotated = not args.gua
-    graph_directed = not args.gud
-
-    node_label = try_eval(args.nl)
-    node_color = try_eval(args.nc)
-    node_opacity = try_eval(args.no)
-    node_size = try_eval(args.ns)
-    node_shape = try_eval(args.nsh)
-    node_border_color = try_eval(args.nbc)
-    node_border_size = try_eval(args.nbs)
-    node_label_color = try_eval(args.nlc)
-    node_label_size = try_eval(args.nls)
-    node_hover = try_eval(args.nh)
-    node_click = try_eval(args.ncl)
-    node_image = try_eval(args.ni)
-    node_properties = try_eval(args.np)
-
-    edge_label = try_eval(args.el)
-    edge_color = try_eval(args.ec)
-    edge_opacity = try_eval(args.eo)
-    edge_size = try_eval(args.es)
-    edge_label_color = try_eval(args.elc)
-    edge_label_size = try_eval(args.els)
-    edge_hover = try_eval(args.eh)
-    edge_click = try_eval(args.ecl)
-
-    kwargs = dict() if args.kwargs is None else args.kwargs
-
-    # Collect
-    filt_args = [filter_target, filter_context, filter_mode]
-    conv_args = [
-        graph_annotated, graph_directed, node_label, node_color, node_opacity, node_size,
-        node_shape, node_border_color, node_border_size, node_label_color, node_label_size,
-        node_hover, node_click, node_image, node_properties,
-        edge_label, edge_color, edge_opacity, edge_size, edge_label_color, edge_label_size,
-        edge_hover, edge_click]
-
-    # Mutually dependent checks
-    if (not overwrite) and (target is not None) and os.path.exists(target):
-        sys.tracebacklimit = 0
-        message = (
-            'The provided output_filepath "{}" already exists. '
-            'You can use --force to overwrite it.'.format(target))
-        raise argparse.ArgumentTypeError(message) from None
+    """
+    values = dict(_DEFAULTS)
+    argv, kwargs_entries = split_kwargs(argv)
+    n = len(argv)
+    i = 0
+    try:
+        if kwargs_entries is not None:
+            values['kwargs'] = parse_kwargs(kwargs_entries)
+        while i < n:
+            name, kind = _FLAGS[argv[i]]
+            if kind == 'flag':
+                values[name] = True
+                i += 1
+            else:
+                value = argv[i + 1]
+                if value.startswith('-'):
+                    return None
+                values[name] = value
+                i += 2
+
+        # Checks and conversions that argparse would perform
+        if values['i'] is None:
+            return None
+        values['i'] = validate_source(values['i'])
+        if values['o'] is not None:
+            values['o'] = validate_target(values['o'])
+        if values['b'] not in _BACKEND_CHOICES:
+            return None
+        if values['l'] is not None and values['l'] not in _LAYOUT_CHOICES:
+            return None
+        if values['fm'] not in _FILTER_MODE_CHOICES:
+            return None
+        # Interned strings make later comparisons like backend == 'd3' an identity check
+        values['b'] = sys.intern(values['b'])
+        values['fm'] = sys.intern(values['fm'])
+        if values['l'] is not None:
+            values['l'] = sys.intern(values['l'])
+        values['cd'] = float(values['cd'])
+        values['fc'] = validate_context(values['fc'])
+    except (KeyError, IndexError, ValueError, argparse.ArgumentTypeError):
+        return None
+    return CliNamespace(**values)
+
+
+class CliNamespace:
+    """Parsed CLI arguments, stored in slots instead of a per-instance dict."""
+
+    __slots__ = tuple(_DEFAULTS)
+
+    def __init__(self, **kwargs):
+        for key, val in kwargs.items():
+            setattr(self, key, val)
+
+
+class FilterOptions:
+    """Arguments for the filtering step."""
+
+    __slots__ = ('target', 'context', 'mode')
+
+    def __init__(self, target, context, mode):
+        self.target = target
+        self.context = context
+        self.mode = mode
+
+
+class ConvertOptions:
+    """Arguments for the conversion step."""
+
+    __slots__ = (
+        'graph_annotated', 'graph_directed',
+        'node_label', 'node_color', 'node_opacity', 'node_size', 'node_shape',
+        'node_border_color', 'node_border_size', 'node_label_color', 'node_label_size',
+        'node_hover', 'node_click', 'node_image', 'node_properties',
+        'edge_label', 'edge_color', 'edge_opacity', 'edge_size',
+        'edge_label_color', 'edge_label_size', 'edge_hover', 'edge_click')
+
+    def __init__(self, *args):
+        for key, val in zip(self.__slots__, args):
+            setattr(self, key, val)
+
+    def as_kwargs(self):
+        """Return all options as dict that can be passed to the convert function."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+def split_kwargs(argv):
+    """Separate the entries of --kwargs from all other arguments in a single pass.
+
+    The entries are all arguments following --kwargs up to the next one that starts
+    with a dash. If --kwargs is given multiple times, the last occurrence is used
+    like in argparse. If it is not given at all, ``None`` is returned as entries.
 
-    # Perform the actions required by the arguments
-    perform_it(
-        source, target, overwrite, verbose, backend, layout, capture_delay, filt_args,
-        conv_args, kwargs)
+    """
+    if '--kwargs' not in argv:
+        return argv, None
+    remaining = []
+    entries = None
+    n = len(argv)
+    i = 0
+    while i < n:
+        if argv[i] == '--kwargs':
+            j = i + 1
+            while j < n and not argv[j].startswith('-'):
+                j += 1
+            entries = argv[i + 1:j]
+            i = j
+        else:
+            remaining.append(argv[i])
+            i += 1
+    return remaining, entries
 
 
 def validate_source(filepath):
     """Check if the given source filepath exists."""
-    if not os.path.exists(filepath):
+    try:
+        os.stat(filepath)
+    except (OSError, ValueError):
         message = 'The source filepath "{}" does not exist.'.format(filepath)
-        raise argparse.ArgumentTypeError(message)
+        raise argparse.ArgumentTypeError(message) from None
     return filepath
 
 
 def validate_target(filepath):
     """Check if the given target filepath ends in a known format."""
-    known_formats = ['.html', '.jpg', '.png', '.svg', '.gml', '.gml.gz', '.gml.bz2']
-    if not any(filepath.endswith(x) for x in known_formats):
+    if not filepath.endswith(_KNOWN_FORMATS):
         message = 'The target filepath needs to end with one of {}'.format(
-            ', '.join('"{}"'.format(x) for x in known_formats))
+            ', '.join('"{}"'.format(x) for x in _KNOWN_FORMATS))
         raise argparse.ArgumentTypeError(message)
     return filepath
 
 
 def validate_context(context):
     """Check if the given filter context is a know string or valid tuple."""
-    if context not in _FILTER_CONTEXTS:
-        try:
-            # Try to convert the command line string into a tuple of form (str, int)
-            context = ast.literal_eval(context)
-            assert isinstance(context, tuple)
-            assert context[0] in ('in', 'out', 'both')
-            assert isinstance(context[1], int)
-            assert context[1] >= 0
-        except Exception:
-            message = (
-                'filter_context needs to be either a string from {} or'
-                """from "('in', 2)", "('out', 2)", "('both', 2)" where """
-                '2 may be replaced by any integer '
-                '>= 0.'.format(', '.join('"{}"'.format(s) for s in _FILTER_CONTEXTS)))
-            raise argparse.ArgumentTypeError(message)
-    return context
+    if context in _FILTER_CONTEXTS:
+        return sys.intern(context)
+    # Try to convert the command line string into a tuple of form (str, int)
+    match = _CONTEXT_PATTERN.fullmatch(context)
+    if match is None:
+        message = (
+            'filter_context needs to be either a string from {} or'
+            """from "('in', 2)", "('out', 2)", "('both', 2)" where """
+            '2 may be replaced by any integer '
+            '>= 0.'.format(', '.join('"{}"'.format(s) for s in _FILTER_CONTEXTS)))
+        raise argparse.ArgumentTypeError(message)
+    return (sys.intern(match.group(2)), int(match.group(3)))
 
 
 class KwargsParser(argparse.Action):
@@ -292,125 +429,182 @@ class KwargsParser(argparse.Action):
 
     """
     def __call__(self, parser, namespace, values, option_string=None):
-        setattr(namespace, self.dest, dict())
-        for value in values:
-            key, value = value.split('=')
-            try:
-                value = ast.literal_eval(value)
-            except Exception:
-                pass
-            getattr(namespace, self.dest)[key] = value
-        if len(getattr(namespace, self.dest)) == 0:
-            raise ValueError('Argument "kwargs" got no entries.')
+        setattr(namespace, self.dest, parse_kwargs(values))
+
+
+def parse_kwargs(values):
+    """Turn a list of "key=value" strings into a dictionary.
+
+    Only the first "=" separates key and value, so values may contain "=" as well.
+
+    """
+    kwargs = dict()
+    for value in values:
+        key, sep, value = value.partition('=')
+        if not sep:
+            raise ValueError('Argument "kwargs" got an entry without "=": {}'.format(key))
+        try:
+            value = _literal_eval(value)
+        except Exception:
+            pass
+        kwargs[key] = value
+    if len(kwargs) == 0:
+        raise ValueError('Argument "kwargs" got no entries.')
+    return kwargs
 
 
 def try_eval(expr):
-    """Try to evaluate a given expression as Python code, e.g. for lists or lambda functions."""
+    """Try to evaluate a given expression as Python code, e.g. for lists or lambda functions.
+
+    Literals such as numbers, strings, lists and dicts are handled by ``ast.literal_eval``.
+    Only expressions that look like a lambda or function call are passed to ``eval``,
+    everything else is used as plain string.
+
+    """
     if expr is not None:
         try:
-            expr = eval(expr)  # dangerous, but ast_eval does not work for lambda functions
-        except Exception:
-            expr = str(expr)
+            expr = _literal_eval(expr)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            if 'lambda' in expr or '(' in expr:
+                try:
+                    expr = eval(compile_expr(expr))  # dangerous, but needed for lambdas
+                except Exception:
+                    expr = str(expr)
+            else:
+                expr = str(expr)
     return expr
 
 
-def perform_it(source, target, overwrite, verbose, backend, layout, capture_delay, filt_args,
-               conv_args, kwargs):
+@functools.lru_cache(maxsize=None)
+def compile_expr(expr):
+    """Compile an expression once, so that repeated identical values reuse the code object."""
+    return compile(expr, '<string>', 'eval')
+
+
+def perform_it(source, target, overwrite, verbose, backend, layout, capture_delay,
+               filter_options, convert_options, kwargs):
     """Perform the actions that were requested from the CLI."""
     # Load
     atomspace = load_atomspace(source, verbose)
 
     # Optional: Filter
-    atoms = filter_atomspace(atomspace, filt_args, verbose)
+    atoms = filter_atomspace(atomspace, filter_options, verbose)
 
     # Convert
-    graph = convert_atomspace_to_graph(atoms, conv_args, verbose)
+    graph = convert_atomspace_to_graph(atoms, convert_options, verbose)
 
     # Optional: Layout
     graph = layout_graph(graph, layout, verbose)
 
     # Plot or export
-    if target is None or any(target.endswith(ext) for ext in ('html', 'jpg', 'png', 'svg')):
-        plot_graph(graph, target, backend, verbose, overwrite, capture_delay, kwargs)
+    ext = get_extension(target)
+    if target is None or ext in _PLOT_EXPORTERS:
+        plot_graph(graph, target, ext, backend, verbose, overwrite, capture_delay, kwargs)
     else:
         export_graph(graph, target, verbose, overwrite)
 
 
 def load_atomspace(source, verbose):
     """Load an Atomspace from a file with print message."""
-    printv('Importing an Atomspace from file "{}".'.format(source), verbose)
+    if verbose:
+        print('Importing an Atomspace from file "{}".'.format(source))
+    from .io import load as _load
+
     atomspace = _load(source)
-    printv('Done. It contains {} Atoms.'.format(atomspace.size()), verbose)
-    printv('', verbose)
+    if verbose:
+        print('Done. It contains {} Atoms.\n'.format(atomspace.size()))
     return atomspace
 
 
-def filter_atomspace(atoms, filter_args, verbose):
+def filter_atomspace(atoms, filter_options, verbose):
     """Filter the AtomSpace and optionally print status messages."""
-    if filter_args[0] is not None:
-        printv('Filtering the AtomSpace', verbose)
-        atoms = _filter(atoms, *filter_args)
-        printv('Done. It contains {} remaining Atoms.'.format(len(atoms)), verbose)
-        printv('', verbose)
+    if filter_options.target is not None:
+        if verbose:
+            print('Filtering the AtomSpace')
+        from .filtering import filter as _filter
+
+        atoms = _filter(
+            atoms, filter_options.target, filter_options.context, filter_options.mode)
+        if verbose:
+            print('Done. It contains {} remaining Atoms.\n'.format(len(atoms)))
     return atoms
 
 
-def convert_atomspace_to_graph(atoms, convert_args, verbose):
+def convert_atomspace_to_graph(atoms, convert_options, verbose):
     """Convert the AtomSpace and optionally print status messages."""
-    printv('Converting the AtomSpace to a graph', verbose)
-    graph = _convert(atoms, *convert_args)
-    printv('Done. It contains {} vertices and {} edges.'.format(
-        len(graph.nodes), len(graph.edges)), verbose)
-    printv('', verbose)
+    if verbose:
+        print('Converting the AtomSpace to a graph')
+    from .conversion import convert as _convert
+
+    graph = _convert(atoms, **convert_options.as_kwargs())
+    if verbose:
+        print('Done. It contains {} vertices and {} edges.\n'.format(
+            len(graph.nodes), len(graph.edges)))
     return graph
 
 
 def layout_graph(graph, layout, verbose):
     """Calculate a graph layout and optionally print status messages."""
     if layout is not None:
-        printv('Calculating a layout with "{}".'.format(layout), verbose)
+        if verbose:
+            print('Calculating a layout with "{}".'.format(layout))
+        from .layouting import layout as _layout
+
         graph = _layout(graph, layout)
-        printv('Done.', verbose)
-        printv('', verbose)
+        if verbose:
+            print('Done.\n')
     return graph
 
 
-def plot_graph(graph, target, backend, verbose, overwrite, capture_delay, kwargs):
+def plot_graph(graph, target, ext, backend, verbose, overwrite, capture_delay, kwargs):
     """Plot the graph, display it or export it as HTML file, optionally print status messages."""
+    from .plotting import plot as _plot
+
     fig = _plot(graph, backend, **kwargs)
     if target is None:
         fig.display()
-    elif target.endswith('html'):
-        printv('Storing a visualization as HTML file to "{}". '.format(target), verbose)
-        fig.export_html(target, overwrite)
-        printv('Done. It has a file size of {} bytes.'.format(get_filesize(target)), verbose)
-    elif target.endswith('jpg'):
-        printv('Storing a visualization as JPG file to "{}". '.format(target), verbose)
-        fig.export_jpg(target, overwrite, capture_delay=capture_delay)
-        printv('Done. It has a file size of {} bytes.'.format(get_filesize(target)), verbose)
-    elif target.endswith('png'):
-        printv('Storing a visualization as PNG file to "{}". '.format(target), verbose)
-        fig.export_png(target, overwrite, capture_delay=capture_delay)
-        printv('Done. It has a file size of {} bytes.'.format(get_filesize(target)), verbose)
-    elif target.endswith('svg'):
-        printv('Storing a visualization as SVG file to "{}". '.format(target), verbose)
-        fig.export_svg(target, overwrite, capture_delay=capture_delay)
-        printv('Done. It has a file size of {} bytes.'.format(get_filesize(target)), verbose)
+    else:
+        format_name, export = _PLOT_EXPORTERS[ext]
+        if verbose:
+            print('Storing a visualization as {} file to "{}". '.format(format_name, target))
+        export(fig, target, overwrite, capture_delay)
+        if verbose:
+            print('Done. It has a file size of {} bytes.'.format(get_filesize(target)))
+
+
+# File extension => (format name, function that exports a figure to a file)
+_PLOT_EXPORTERS = {
+    'html': ('HTML', lambda fig, target, overwrite, capture_delay: fig.export_html(
+        target, overwrite)),
+    'jpg': ('JPG', lambda fig, target, overwrite, capture_delay: fig.export_jpg(
+        target, overwrite, capture_delay=capture_delay)),
+    'png': ('PNG', lambda fig, target, overwrite, capture_delay: fig.export_png(
+        target, overwrite, capture_delay=capture_delay)),
+    'svg': ('SVG', lambda fig, target, overwrite, capture_delay: fig.export_svg(
+        target, overwrite, capture_delay=capture_delay)),
+}
 
 
 def export_graph(graph, target, verbose, overwrite):
     """Export the graph as GML file and optionally print status messages."""
-    printv('Storing a GML graph representation to "{}".'.format(target), verbose)
-    _export(graph, target, overwrite=overwrite)
-    printv('Done. It has a file size of {} bytes.'.format(get_filesize(target)), verbose)
-
+    if verbose:
+        print('Storing a GML graph representation to "{}".'.format(target))
+    from .io import export as _export
 
-def printv(message, verbose):
-    """Print or ignore the given message."""
+    _export(graph, target, overwrite=overwrite)
     if verbose:
-        print(message)
+        print('Done. It has a file size of {} bytes.'.format(get_filesize(target)))
 
 
 def get_filesize(filepath):
     """Get the size of a file in bytes."""
-    return os.path.getsize(filepath)
+    return os.stat(filepath).st_size
+
+
+def get_extension(filepath):
+    """Get the file extension of a filepath, where compressed GML counts as one extension."""
+    if filepath is None:
+        return ''
+    if filepath.endswith(('.gml.gz', '.gml.bz2')):
+        return 'gml.' + filepath.rsplit('.', 1)[1]
+    return os.path.splitext(filepath)[1].lstrip('.')
@@ -1,10 +1,20 @@
+import sys as _sys
 from collections.abc import Callable as _Callable
 
 import networkx as _nx
+import numpy as _np
 from opencog.type_constructors import AtomSpace as _AtomSpace
 
 from .args import check_arg as _check_arg
 
+_STR_TYPES = (str, )
+_NUM_TYPES = (int, float)
+
+
+def to_uid(atom):
+    """Return a unique identifier for an Atom."""
+    return atom.id_string()
+
 
 def convert(data, graph_annotated=True, graph_directed=True,
             node_label=None, node_color=None, node_opacity=None, node_size=None, node_shape=None,
@@ -12,7 +22,8 @@ def convert(data, graph_annotated=True, graph_directed=True,
             node_label_color=None, node_label_size=None, node_hover=None, node_click=None,
             node_image=None, node_properties=None,
             edge_label=None, edge_color=None, edge_opacity=None, edge_size=None,
-            edge_label_color=None, edge_label_size=None, edge_hover=None, edge_click=None):
+            edge_label_color=None, edge_label_size=None, edge_hover=None, edge_click=None,
+            graph_format='networkx', uid_mode='id_string'):
     """Convert an Atomspace or list of Atoms to a NetworkX graph with annotations.
 
     Several arguments accept a Callable.
@@ -133,11 +144,37 @@ def convert(data, graph_annotated=True, graph_directed=True,
         of the edge.
     edge_hover : str, Callable
     edge_click : str, Callable
+    graph_format : str
+        Format of the returned graph.
+
+        Possible values:
+
+        - ``"networkx"``: A NetworkX Graph or DiGraph.
+        - ``"csr"``: A compressed sparse row representation, which needs much less RAM
+          for large AtomSpaces and suits consumers that only scan the edges in order.
+          It is a tuple ``(uids, indptr, indices, node_attrs, edge_attrs)`` where
+          the outgoing edges of node ``uids[i]`` point to the nodes
+          ``uids[j]`` for ``j`` in ``indices[indptr[i]:indptr[i+1]]``.
+          ``node_attrs`` and ``edge_attrs`` are lists of annotation dicts in the
+          same order as ``uids`` and ``indices``, or ``None`` if ``graph_annotated``
+          is ``False``. The edges always point from a Link to its outgoing Atoms,
+          so ``graph_directed`` has no effect.
+    uid_mode : str
+        Kind of identifier that each node gets in the graph.
+
+        Possible values:
+
+        - ``"id_string"``: The id string of the Atom, which is stable across
+          sessions and should be used if the graph is exported or plotted.
+        - ``"fast"``: The Python ``id`` of the Atom object, which avoids one call into
+          the AtomSpace and one string allocation per Atom. It is only unique
+          within the created graph and does not identify the Atom afterwards.
 
     Returns
     -------
-    graph : NetworkX Graph or DiGraph
+    graph : NetworkX Graph or DiGraph, or tuple
         Whether an undirected or directed graph is created depends on the argument "directed".
+        A tuple is returned if the argument "graph_format" is ``"csr"``.
 
     """
     # Argument processing
@@ -146,88 +183,207 @@ def convert(data, graph_annotated=True, graph_directed=True,
     _check_arg(graph_annotated, 'graph_annotated', bool)
     _check_arg(graph_directed, 'graph_directed', bool)
 
-    _check_arg(node_label, 'node_label', (str, _Callable), allow_none=True)
-    _check_arg(node_color, 'node_color', (str, _Callable), allow_none=True)
-    _check_arg(node_opacity, 'node_opacity', (int, float, _Callable), allow_none=True)
-    _check_arg(node_size, 'node_size', (int, float, _Callable), allow_none=True)
-    _check_arg(node_shape, 'node_shape', (str, _Callable), allow_none=True)
-    _check_arg(node_border_color, 'node_border_color', (str, _Callable), allow_none=True)
-    _check_arg(node_border_size, 'node_border_size', (int, float, _Callable), allow_none=True)
-    _check_arg(node_label_color, 'node_label_color', (str, _Callable), allow_none=True)
-    _check_arg(node_label_size, 'node_label_size', (int, float, _Callable), allow_none=True)
-    _check_arg(node_hover, 'node_hover', (str, _Callable), allow_none=True)
-    _check_arg(node_click, 'node_click', (str, _Callable), allow_none=True)
-    _check_arg(node_image, 'node_image', (str, _Callable), allow_none=True)
-    _check_arg(node_properties, 'node_properties', (str, dict, _Callable), allow_none=True)
-
-    _check_arg(edge_label, 'edge_label', (str, _Callable), allow_none=True)
-    _check_arg(edge_color, 'edge_color', (str, _Callable), allow_none=True)
-    _check_arg(edge_opacity, 'edge_opacity', (int, float, _Callable), allow_none=True)
-    _check_arg(edge_size, 'edge_size', (int, float, _Callable), allow_none=True)
-    _check_arg(edge_label_color, 'edge_label_color', (str, _Callable), allow_none=True)
-    _check_arg(edge_label_size, 'edge_label_size', (int, float, _Callable), allow_none=True)
-    _check_arg(edge_hover, 'edge_hover', (str, _Callable), allow_none=True)
-    _check_arg(edge_click, 'edge_click', (str, _Callable), allow_none=True)
+    # - annotation arguments are mostly None, so only given values get a full check
+    given = (
+        node_label, node_color, node_opacity, node_size, node_shape, node_border_color,
+        node_border_size, node_label_color, node_label_size, node_hover, node_click,
+        node_image, node_properties, edge_label, edge_color, edge_opacity, edge_size,
+        edge_label_color, edge_label_size, edge_hover, edge_click)
+    for value, (name, allowed_types) in zip(given, _ANNOTATION_ARG_TYPES):
+        if value is not None and not isinstance(value, allowed_types):
+            _check_arg(value, name, allowed_types)
+
+    _check_arg(graph_format, 'graph_format', str, ('networkx', 'csr'))
+    _check_arg(uid_mode, 'uid_mode', str, ('id_string', 'fast'))
+    calc_uid = to_uid if uid_mode == 'id_string' else id
 
     # Prepare annoation functions
+    # - NetworkX copies each given attribute dict, so elements without annotations
+    #   can share one empty dict, while CSR output hands the dicts to the caller
+    share_empty = graph_format == 'networkx'
     if graph_annotated:
         node_ann = prepare_node_func(
             node_label, node_color, node_opacity, node_size, node_shape, node_border_color,
             node_border_size, node_label_color, node_label_size, node_hover, node_click,
-            node_image, node_properties)
+            node_image, node_properties, share_empty)
         edge_ann = prepare_edge_func(
             edge_label, edge_color, edge_opacity, edge_size,
-            edge_label_color, edge_label_size, edge_hover, edge_click)
+            edge_label_color, edge_label_size, edge_hover, edge_click, share_empty)
     else:
-        empty = dict()
-
-        def node_ann(atom):
-            return empty
+        node_ann = edge_ann = None
 
-        def edge_ann(atom1, atom2):
-            return empty
+    # Create the CSR representation
+    if graph_format == 'csr':
+        return to_csr(data, node_ann, edge_ann, calc_uid)
 
     # Create the NetworkX graph
     graph = _nx.DiGraph() if graph_directed else _nx.Graph()
+    if graph_annotated:
+        add_annotated(graph, data, node_ann, edge_ann, calc_uid)
+    else:
+        add_unannotated(graph, data, calc_uid)
+    return graph
+
+
+def add_annotated(graph, data, node_ann, edge_ann, calc_uid=to_uid):
+    """Add nodes and edges with annotations to a graph."""
     # 0) Set graph annotations
     graph.graph['node_click'] = '$hover'  # node_click will by default show content of node_hover
-    # 1) Add vertices and their annotations
+    # 1) Add vertices and their annotations, remember the uid of each Atom
+    # - data is enumerated only once, Links are kept with their uid for the edge pass
+    # - methods used in the loops are bound to local names once
+    # - annotations are calculated column-wise for all Atoms at once
+    uid_of = dict()
+    atoms = []
+    uids = []
+    links = []
+    add_atom = atoms.append
+    add_uid = uids.append
+    add_link = links.append
     for atom in data:
-        graph.add_node(to_uid(atom), **node_ann(atom))
+        if atom in uid_of:
+            continue
+        uid = calc_uid(atom)
+        uid_of[atom] = uid
+        add_atom(atom)
+        add_uid(uid)
+        if atom.is_link():
+            add_link((atom, uid))
+    graph.add_nodes_from(zip(uids, node_ann(atoms)))
     # 2) Add edges and their annotations (separate step to exclude edges to filtered vertices)
+    # - membership of a neighbor is a plain dict lookup that yields None for absent Atoms
+    get_uid = uid_of.get
+    sources = []
+    targets = []
+    uid_pairs = []
+    add_source = sources.append
+    add_target = targets.append
+    add_uid_pair = uid_pairs.append
+    for atom, uid in links:
+        # for all that is outgoing of the Atom
+        # - incoming edges need no separate walk, because each of them is
+        #   an outgoing edge of another Link in data and is added there
+        for atom2 in atom.out:
+            uid2 = get_uid(atom2)
+            if uid2 is not None:
+                add_source(atom)
+                add_target(atom2)
+                add_uid_pair((uid, uid2))
+    graph.add_edges_from(
+        (uid1, uid2, ann) for (uid1, uid2), ann in zip(uid_pairs, edge_ann(sources, targets)))
+
+
+def add_unannotated(graph, data, calc_uid=to_uid):
+    """Add bare nodes and edges to a graph, without allocating any attribute dicts.
+
+    Atoms are numbered by their position, so that edges can be collected as two
+    integer arrays, deduplicated and translated to uids by numpy in one step each.
+
+    """
+    # 0) Set graph annotations
+    graph.graph['node_click'] = '$hover'  # node_click will by default show content of node_hover
+    # 1) Add vertices, remember the position of each Atom
+    iloc_of = dict()
+    uids = []
+    links = []
+    add_uid = uids.append
+    add_link = links.append
+    for atom in data:
+        if atom not in iloc_of:
+            iloc = iloc_of[atom] = len(uids)
+            add_uid(calc_uid(atom))
+            if atom.is_link():
+                add_link((atom, iloc))
+    graph.add_nodes_from(uids)
+    # 2) Add edges as pairs of positions, which are translated to uids
+    get_iloc = iloc_of.get
+    src = []
+    dst = []
+    add_src = src.append
+    add_dst = dst.append
+    for atom, iloc in links:
+        for atom2 in atom.out:
+            iloc2 = get_iloc(atom2)
+            if iloc2 is not None:
+                add_src(iloc)
+                add_dst(iloc2)
+    if src:
+        ilocs = _np.unique(_np.array([src, dst], dtype=_np.int64), axis=1)
+        uid_array = _np.array(uids, dtype=object)
+        graph.add_edges_from(zip(uid_array[ilocs[0]], uid_array[ilocs[1]]))
+
+
+def to_csr(data, node_ann=None, edge_ann=None, calc_uid=to_uid):
+    """Create a compressed sparse row representation of Atoms and their outgoing sets.
+
+    Annotations are only calculated if the annotation functions are given.
+
+    """
+    # 1) Number the Atoms by position, ignoring repeated Atoms
+    iloc_of = dict()
+    atoms = []
+    uids = []
+    add_atom = atoms.append
+    add_uid = uids.append
     for atom in data:
-        uid = to_uid(atom)
+        if atom not in iloc_of:
+            iloc_of[atom] = len(atoms)
+            add_atom(atom)
+            add_uid(calc_uid(atom))
+    # 2) Collect the outgoing neighbors of each Atom as one row, without repeated neighbors
+    get_iloc = iloc_of.get
+    counts = []
+    indices = []
+    sources = []
+    targets = []
+    add_count = counts.append
+    add_index = indices.append
+    add_source = sources.append
+    add_target = targets.append
+    for atom in atoms:
+        num_before = len(indices)
         if atom.is_link():
-            # for all that is incoming to the Atom
-            for atom2 in atom.incoming:
-                uid2 = to_uid(atom2)
-                if uid2 in graph.nodes:
-                    graph.add_edge(uid2, uid, **edge_ann(atom2, atom))
-            # for all that is outgoing of the Atom
+            seen = set()
             for atom2 in atom.out:
-                uid2 = to_uid(atom2)
-                if uid2 in graph.nodes:
-                    graph.add_edge(uid, uid2, **edge_ann(atom, atom2))
-    return graph
+                iloc2 = get_iloc(atom2)
+                if iloc2 is not None and iloc2 not in seen:
+                    seen.add(iloc2)
+                    add_index(iloc2)
+                    add_source(atom)
+                    add_target(atom2)
+        add_count(len(indices) - num_before)
+    indptr = _np.zeros(len(atoms) + 1, dtype=_np.int64)
+    _np.cumsum(counts, out=indptr[1:])
+    indices = _np.array(indices, dtype=_np.int64)
+    # 3) Calculate annotations
+    node_attrs = None if node_ann is None else node_ann(atoms)
+    edge_attrs = None if edge_ann is None else edge_ann(sources, targets)
+    return uids, indptr, indices, node_attrs, edge_attrs
 
 
 def prepare_node_func(node_label, node_color, node_opacity, node_size, node_shape,
                       node_border_color, node_border_size, node_label_color, node_label_size,
-                      node_hover, node_click, node_image, node_properties):
-    """Prepare a function that calculates all annoations for a node representing an Atom."""
-    # individual node annotation functions
-    node_label = use_node_def_or_str(node_label, node_label_default)
-    node_color = use_node_def_or_str(node_color, node_color_default)
-    node_opacity = use_node_def_or_num(node_opacity, node_opacity_default)
-    node_size = use_node_def_or_num(node_size, node_size_default)
-    node_shape = use_node_def_or_str(node_shape, node_shape_default)
-    node_border_color = use_node_def_or_str(node_border_color, node_border_color_default)
-    node_border_size = use_node_def_or_num(node_border_size, node_border_size_default)
-    node_label_color = use_node_def_or_str(node_label_color, node_label_color_default)
-    node_label_size = use_node_def_or_num(node_label_size, node_label_size_default)
-    node_hover = use_node_def_or_str(node_hover, node_hover_default)
-    node_click = use_node_def_or_str(node_click, node_click_default)
-    node_image = use_node_def_or_str(node_image, node_image_default)
+                      node_hover, node_click, node_image, node_properties, share_empty=False):
+    """Prepare a function that calculates all annoations for the nodes representing Atoms.
+
+    The returned function gets a list of Atoms and returns a list of annotation dicts.
+    The annotations of a single Atom are calculated by generated straight-line code,
+    constants are not calculated at all.
+
+    """
+    # individual node annotations, each as (kind, payload) with kind 'const' or 'call'
+    node_label = use_def_or_const(node_label, node_label_default, _STR_TYPES)
+    node_color = use_def_or_const(node_color, node_color_default, _STR_TYPES)
+    node_opacity = use_def_or_const(node_opacity, node_opacity_default, _NUM_TYPES)
+    node_size = use_def_or_const(node_size, node_size_default, _NUM_TYPES)
+    node_shape = use_def_or_const(node_shape, node_shape_default, _STR_TYPES)
+    node_border_color = use_def_or_const(node_border_color, node_border_color_default, _STR_TYPES)
+    node_border_size = use_def_or_const(node_border_size, node_border_size_default, _NUM_TYPES)
+    node_label_color = use_def_or_const(node_label_color, node_label_color_default, _STR_TYPES)
+    node_label_size = use_def_or_const(node_label_size, node_label_size_default, _NUM_TYPES)
+    node_hover = use_def_or_const(node_hover, node_hover_default, _STR_TYPES)
+    node_click = use_def_or_const(node_click, node_click_default, _STR_TYPES)
+    node_image = use_def_or_const(node_image, node_image_default, _STR_TYPES)
 
     # special case: additional user-defined node properties by a function that returns a dict
     if node_properties is None:
@@ -238,144 +394,186 @@ def prepare_node_func(node_label, node_color, node_opacity, node_size, node_shap
         def node_properties(atom):
             return val
     elif node_properties == 'tv':
-        node_properties = node_properties_tv
-
-    # combined node annotation function: calls each of the individual ones
-    name_func = (
-        ('label', node_label),
-        ('color', node_color),
-        ('opacity', node_opacity),
-        ('size', node_size),
-        ('shape', node_shape),
-        ('border_color', node_border_color),
-        ('border_size', node_border_size),
-        ('label_color', node_label_color),
-        ('label_size', node_label_size),
-        ('hover', node_hover),
-        ('click', node_click),
-        ('image', node_image),
+        node_properties = guard_node_properties(node_properties_tv)
+    elif isinstance(node_properties, str):
+        # unknown names add no properties
+        node_properties = node_properties_default
+    else:
+        node_properties = guard_node_properties(node_properties)
+
+    # combined node annotation function: starts with the constant annotations
+    # and calls each of the individual functions for the others
+    name_kind_payload = (
+        ('label', ) + node_label,
+        ('color', ) + node_color,
+        ('opacity', ) + node_opacity,
+        ('size', ) + node_size,
+        ('shape', ) + node_shape,
+        ('border_color', ) + node_border_color,
+        ('border_size', ) + node_border_size,
+        ('label_color', ) + node_label_color,
+        ('label_size', ) + node_label_size,
+        ('hover', ) + node_hover,
+        ('click', ) + node_click,
+        ('image', ) + node_image,
     )
-
-    def func(atom):
-        data = {}
-        for n, f in name_func:
-            val = f(atom)
-            if val is not None:
-                data[n] = val
-        try:
-            data.update(node_properties(atom))
-        except Exception:
-            pass
+    constants, name_func = split_annotations(name_kind_payload)
+
+    # - node properties are added to the returned dicts in place, so they must not be shared
+    share_empty = share_empty and node_properties is node_properties_default
+    row_func = compile_annotation_func(constants, name_func, 'atom', share_empty)
+
+    def func(atoms):
+        data = [row_func(atom) for atom in atoms]
+        if node_properties is not node_properties_default:
+            for item, atom in zip(data, atoms):
+                extra = node_properties(atom)
+                if extra:
+                    item.update(extra)
         return data
     return func
 
 
 def prepare_edge_func(edge_label, edge_color, edge_opacity, edge_size, edge_label_color,
-                      edge_label_size, edge_hover, edge_click):
-    """Prepare a function that calculates all annoations for an edge between Atoms."""
-    # individual edge annotation functions
-    edge_label = use_edge_def_or_str(edge_label, edge_label_default)
-    edge_color = use_edge_def_or_str(edge_color, edge_color_default)
-    edge_opacity = use_edge_def_or_num(edge_opacity, edge_opacity_default)
-    edge_size = use_edge_def_or_num(edge_size, edge_size_default)
-    edge_label_color = use_edge_def_or_str(edge_label_color, edge_label_color_default)
-    edge_label_size = use_edge_def_or_num(edge_label_size, edge_label_size_default)
-    edge_hover = use_edge_def_or_str(edge_hover, edge_hover_default)
-    edge_click = use_edge_def_or_str(edge_click, edge_click_default)
-
-    # combined edge annotation function: calls each of the individual ones
-    name_func = (
-        ('label', edge_label),
-        ('color', edge_color),
-        ('opacity', edge_opacity),
-        ('size', edge_size),
-        ('label_color', edge_label_color),
-        ('label_size', edge_label_size),
-        ('hover', edge_hover),
-        ('click', edge_click),
+                      edge_label_size, edge_hover, edge_click, share_empty=False):
+    """Prepare a function that calculates all annoations for the edges between Atoms.
+
+    The returned function gets two lists of Atoms, the sources and targets of the edges,
+    and returns a list of annotation dicts.
+
+    """
+    # individual edge annotations, each as (kind, payload) with kind 'const' or 'call'
+    edge_label = use_def_or_const(edge_label, edge_label_default, _STR_TYPES)
+    edge_color = use_def_or_const(edge_color, edge_color_default, _STR_TYPES)
+    edge_opacity = use_def_or_const(edge_opacity, edge_opacity_default, _NUM_TYPES)
+    edge_size = use_def_or_const(edge_size, edge_size_default, _NUM_TYPES)
+    edge_label_color = use_def_or_const(edge_label_color, edge_label_color_default, _STR_TYPES)
+    edge_label_size = use_def_or_const(edge_label_size, edge_label_size_default, _NUM_TYPES)
+    edge_hover = use_def_or_const(edge_hover, edge_hover_default, _STR_TYPES)
+    edge_click = use_def_or_const(edge_click, edge_click_default, _STR_TYPES)
+
+    # combined edge annotation function: starts with the constant annotations
+    # and calls each of the individual functions for the others
+    name_kind_payload = (
+        ('label', ) + edge_label,
+        ('color', ) + edge_color,
+        ('opacity', ) + edge_opacity,
+        ('size', ) + edge_size,
+        ('label_color', ) + edge_label_color,
+        ('label_size', ) + edge_label_size,
+        ('hover', ) + edge_hover,
+        ('click', ) + edge_click,
     )
+    constants, name_func = split_annotations(name_kind_payload)
 
-    def func(atom1, atom2):
-        data = {}
-        for n, f in name_func:
-            val = f(atom1, atom2)
-            if val is not None:
-                data[n] = val
-        return data
-    return func
+    row_func = compile_annotation_func(constants, name_func, 'atom1, atom2', share_empty)
 
+    def func(atoms1, atoms2):
+        return [row_func(atom1, atom2) for atom1, atom2 in zip(atoms1, atoms2)]
+    return func
 
-def use_node_def_or_str(given_value, default_func):
-    """Transform a value of type (None, str, Callable) to a node annotation function."""
-    # Default: use pre-defined function from this module
-    if given_value is None:
-        func = default_func
-    # Transform: value to function that returns the value
-    elif isinstance(given_value, str):
-        given_value = str(given_value)
 
-        def func(atom):
-            return given_value
-    # Passthrough: value itself is a function
-    else:
-        func = given_value
+def guard_node_properties(node_properties):
+    """Wrap a node properties function so that a failing call adds no properties."""
+    def func(atom):
+        try:
+            return dict(node_properties(atom))
+        except Exception:
+            return None
     return func
 
 
-def use_node_def_or_num(given_value, default_func):
-    """Transform a value of type (None, int, float, Callable) to a node annotation function."""
-    # Default: use pre-defined function from this module
-    if given_value is None:
-        func = default_func
-    # Transform: value to function that returns the value
-    elif isinstance(given_value, (int, float)):
-        given_value = float(given_value)
+def compile_annotation_func(constants, name_func, params, share_empty=False):
+    """Generate a function that returns the annotation dict of a single element.
 
-        def func(atom):
-            return given_value
-    # Passthrough: value itself is a function
+    Instead of looping over the annotation functions, the generated code calls each
+    of them in a fixed sequence, which is known once the arguments are processed.
+
+    Parameters
+    ----------
+    constants : dict
+        Annotations with a constant value, which every returned dict starts with.
+    name_func : tuple of (str, Callable) pairs
+        Annotations that are calculated by a function and added if it does not return None.
+    params : str
+        Parameter list of the generated function, e.g. ``"atom"`` or ``"atom1, atom2"``.
+    share_empty : bool
+        If ``True`` and there are no constant annotations, values are collected in
+        a reused scratch dict and elements without any annotation all get the same
+        empty dict. This is only safe if the caller copies or never modifies the result.
+
+    """
+    namespace = dict(_constants=constants, _scratch=dict(), _empty=dict())
+    scratch = share_empty and not constants
+    lines = ['def func({}):'.format(params)]
+    if scratch:
+        lines.append('    data = _scratch')
+        lines.append('    data.clear()')
     else:
-        func = given_value
-    return func
+        lines.append('    data = _constants.copy()')
+    # - defaults that only distinguish Nodes from Links share a single is_node call
+    if any(id(func) in _DEFAULTS_BY_KIND for _, func in name_func):
+        lines.append('    is_node = atom.is_node()')
+    for i, (name, func) in enumerate(name_func):
+        if id(func) in _DEFAULTS_BY_KIND:
+            exprs = []
+            for kind, value in zip('nl', _DEFAULTS_BY_KIND[id(func)]):
+                value_name = '_{}{}'.format(kind, i)
+                namespace[value_name] = value
+                if callable(value):
+                    value_name = '{}({})'.format(value_name, params)
+                exprs.append(value_name)
+            lines.append('    val = {} if is_node else {}'.format(*exprs))
+        else:
+            func_name = '_f{}'.format(i)
+            namespace[func_name] = func
+            lines.append('    val = {}({})'.format(func_name, params))
+        lines.append('    if val is not None:')
+        lines.append('        data[{!r}] = val'.format(name))
+    if scratch:
+        lines.append('    return data.copy() if data else _empty')
+    else:
+        lines.append('    return data')
+    exec('\n'.join(lines), namespace)
+    return namespace['func']
 
 
-def use_edge_def_or_str(given_value, default_func):
-    """Transform a value of type (None, str, Callable) to an edge annotation function."""
-    # Default: use pre-defined function from this module
-    if given_value is None:
-        func = default_func
-    # Transform: value to function that returns the value
-    elif isinstance(given_value, str):
-        given_value = str(given_value)
+def split_annotations(name_kind_payload):
+    """Separate constant annotations from those that need to be calculated by a function.
+
+    Default functions that always return None are skipped entirely,
+    because they never contribute a value.
+
+    """
+    constants = dict()
+    name_func = []
+    for name, kind, payload in name_kind_payload:
+        if kind == 'const':
+            constants[name] = payload
+        elif id(payload) not in _CONSTANT_NONE_DEFAULTS:
+            name_func.append((name, payload))
+    return constants, tuple(name_func)
 
-        def func(atom1, atom2):
-            return given_value
-    # Passthrough: value itself is a function
-    else:
-        func = given_value
-    return func
 
+def use_def_or_const(given_value, default_func, const_types):
+    """Transform a value of type (None, const_types, Callable) to an annotation.
 
-def use_edge_def_or_num(given_value, default_func):
-    """Transform a value of type (None, int, float, Callable) to an edge annotation function."""
+    Strings are interned and numbers are converted to float.
+
+    """
     # Default: use pre-defined function from this module
     if given_value is None:
-        func = default_func
-    # Transform: value to function that returns the value
-    elif isinstance(given_value, (int, float)):
-        given_value = float(given_value)
-
-        def func(atom1, atom2):
-            return given_value
+        annotation = ('call', default_func)
+    # Constant: value is used directly without calling a function
+    elif isinstance(given_value, const_types):
+        if const_types is _STR_TYPES:
+            annotation = ('const', _sys.intern(str(given_value)))
+        else:
+            annotation = ('const', float(given_value))
     # Passthrough: value itself is a function
     else:
-        func = given_value
-    return func
-
-
-def to_uid(atom):
-    """Return a unique identifier for an Atom."""
-    return atom.id_string()
+        annotation = ('call', given_value)
+    return annotation
 
 
 # Default functions for node annotations
@@ -386,7 +584,18 @@ def to_uid(atom):
 
 def node_label_default(atom):
     # None => no node labels
-    return '{} "{}"'.format(atom.type_name, atom.name) if atom.is_node() else atom.type_name
+    if atom.is_node():
+        return node_label_of_node(atom)
+    return node_label_of_link(atom)
+
+
+def node_label_of_node(atom):
+    return '{} "{}"'.format(atom.type_name, atom.name)
+
+
+def node_label_of_link(atom):
+    # Link labels repeat for all Links of a type, interning lets them share one string
+    return _sys.intern(atom.type_name)
 
 
 def node_color_default(atom):
@@ -450,7 +659,8 @@ def node_properties_default(atom):
 
 
 def node_properties_tv(atom):
-    return dict(mean=atom.tv.mean, confidence=atom.tv.confidence)
+    tv = atom.tv  # creates a new TruthValue wrapper on each access
+    return dict(mean=tv.mean, confidence=tv.confidence)
 
 
 # Default functions for edge annotations
@@ -493,3 +703,60 @@ def edge_hover_default(atom1, atom2):
 def edge_click_default(atom1, atom2):
     # None => no click text (in addition to always shown "Edge: <id>" in header)
     return None
+
+
+# Default functions that always return None and therefore can be skipped entirely
+# - keyed by id, so that a lookup never hashes or compares a user-provided callable
+_CONSTANT_NONE_DEFAULTS = frozenset(map(id, [
+    node_opacity_default,
+    node_size_default,
+    node_border_color_default,
+    node_border_size_default,
+    node_label_color_default,
+    node_label_size_default,
+    node_click_default,
+    node_image_default,
+    edge_label_default,
+    edge_opacity_default,
+    edge_size_default,
+    edge_label_color_default,
+    edge_label_size_default,
+    edge_hover_default,
+    edge_click_default,
+]))
+
+
+# Default functions whose result only depends on whether an Atom is a Node or a Link
+# - each is replaced by a (Node value, Link value) pair, where a value is a constant or
+#   a function of the Atom, so that is_node is called only once per Atom
+# - keyed by id like the set above
+_DEFAULTS_BY_KIND = {
+    id(node_label_default): (node_label_of_node, node_label_of_link),
+    id(node_color_default): ('red', None),
+    id(node_shape_default): ('rectangle', None),
+}
+
+# Allowed types of the annotation arguments of convert, in order of its signature
+_ANNOTATION_ARG_TYPES = (
+    ('node_label', (str, _Callable)),
+    ('node_color', (str, _Callable)),
+    ('node_opacity', (int, float, _Callable)),
+    ('node_size', (int, float, _Callable)),
+    ('node_shape', (str, _Callable)),
+    ('node_border_color', (str, _Callable)),
+    ('node_border_size', (int, float, _Callable)),
+    ('node_label_color', (str, _Callable)),
+    ('node_label_size', (int, float, _Callable)),
+    ('node_hover', (str, _Callable)),
+    ('node_click', (str, _Callable)),
+    ('node_image', (str, _Callable)),
+    ('node_properties', (str, dict, _Callable)),
+    ('edge_label', (str, _Callable)),
+    ('edge_color', (str, _Callable)),
+    ('edge_opacity', (int, float, _Callable)),
+    ('edge_size', (int, float, _Callable)),
+    ('edge_label_color', (str, _Callable)),
+    ('edge_label_size', (int, float, _Callable)),
+    ('edge_hover', (str, _Callable)),
+    ('edge_click', (str, _Callable)),
+)
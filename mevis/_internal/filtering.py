@@ -1,6 +1,11 @@
+import builtins as _builtins
 from collections.abc import Callable as _Callable
+from collections.abc import Iterator as _Iterator
+from functools import lru_cache as _lru_cache
+from itertools import filterfalse as _filterfalse
 
 from opencog.atomspace import Atom as _Atom
+from opencog.atomspace import types as _types
 from opencog.type_constructors import AtomSpace as _AtomSpace
 
 from .args import check_arg as _check_arg
@@ -9,14 +14,14 @@ from .args import check_arg as _check_arg
 FILTER_CONTEXTS = ['atom', 'in', 'out', 'both', 'in-tree', 'out-tree']
 
 
-def filter(data, target, context='atom', mode='include'):
+def filter(data, target, context='atom', mode='include', cache=False):
     """Apply a filter to an Atomspace or list of Atoms and return a list of selected Atoms.
 
     Parameters
     ----------
-    data : Atomspace, list of Atoms
+    data : Atomspace, list of Atoms, iterator of Atoms
         The given Atomspace or list of Atoms that is filtered and thereby reduced to a
-        shorter list of Atoms.
+        shorter list of Atoms. An iterator, e.g. from :func:`ifilter`, is consumed.
     target : str, int, Atom, list, Callable
         The targets that are selected by this filtering function.
 
@@ -112,6 +117,14 @@ def filter(data, target, context='atom', mode='include'):
         - ``include``: The selection is included in the result.
         - ``exclude``: The selection is excluded from the result. Everything else is included.
 
+    cache : bool
+        If ``True`` and ``target`` is a Callable, its result for each Atom is remembered,
+        so that chained or repeated filter calls with the same Callable do not call it
+        again for the same Atom. The results of the last eight Callables are kept,
+        which also keeps the tested Atoms in memory. Only suitable for Callables
+        without side effects whose results do not change, e.g. not if they depend
+        on truth values that are modified in between.
+
     Returns
     -------
     atoms : list of Atoms
@@ -135,9 +148,10 @@ def filter(data, target, context='atom', mode='include'):
 
     """
     # Argument processing
-    _check_arg(data, 'data', (list, _AtomSpace))
+    _check_arg(data, 'data', (list, _AtomSpace, _Iterator))
     _check_arg(target, 'target', (str, int, list, _Callable, _Atom))
     _check_arg(mode, 'mode', str, ['include', 'exclude'])
+    _check_arg(cache, 'cache', bool)
     if isinstance(context, tuple):
         context, size = context
         try:
@@ -151,14 +165,33 @@ def filter(data, target, context='atom', mode='include'):
     else:
         _check_arg(context, 'context', str, FILTER_CONTEXTS)
         size = 1
+
+    # Shortcut: a single Atom without context needs no filtering or expansion
+    if isinstance(target, _Atom) and context == 'atom':
+        if mode == 'include':
+            return [target]
+        return [atom for atom in data if atom != target]
+
+    # Shortcut: excluding without context needs only one pass over the data, unless the
+    # AtomSpace can select the Atoms of a type itself
+    if mode == 'exclude' and context == 'atom' and not (
+            isinstance(data, _AtomSpace) and isinstance(target, (int, str, list))):
+        return list(_filterfalse(_prepare_filter_func(target, cache), data))
+
     given_atoms = data
+    if mode == 'exclude' and not isinstance(given_atoms, list):
+        # filtering and excluding both iterate over the data, so an AtomSpace is listed once
+        given_atoms = list(given_atoms)
 
     # Filter: Select all Atoms as specified by target
+    selected_atoms = None
     if isinstance(target, _Atom):
         selected_atoms = [target]
-    else:
-        func = _prepare_filter_func(target)
-        selected_atoms = [atom for atom in given_atoms if func(atom)]
+    elif isinstance(data, _AtomSpace) and isinstance(target, (int, str, list)):
+        # the AtomSpace selects Atoms of a type itself, without a Python call per Atom
+        selected_atoms = _select_by_type(data, target)
+    if selected_atoms is None:
+        selected_atoms = list(_iter_filtered(given_atoms, target, cache))
 
     # Expand by context: if desired, include some neighboring atoms
     selected_atoms = _expand(selected_atoms, context, size)
@@ -168,99 +201,215 @@ def filter(data, target, context='atom', mode='include'):
     return atoms
 
 
-def _prepare_filter_func(target):
+def ifilter(data, target, context='atom', mode='include', cache=False):
+    """Apply a filter to an Atomspace or list of Atoms and return an iterator of selected Atoms.
+
+    This works like :func:`filter` and accepts the same arguments. In the default
+    context ``atom``, the Atoms are tested and returned one at a time, so that
+    chained filter steps process the data as a single stream without building
+    intermediate lists. Other contexts need the complete selection to expand it,
+    therefore they fall back to :func:`filter`. Example::
+
+        import mevis as mv
+
+        atomspace = mv.load('moses.scm')
+        atoms = mv.ifilter(atomspace, target="PredicateNode", mode="exclude")
+        atoms = mv.filter(atoms, target=lambda atom: atom.is_link())
+
+    Returns
+    -------
+    atoms : iterator of Atoms
+
+    """
+    if context != 'atom' or isinstance(target, _Atom):
+        return iter(filter(data, target, context, mode, cache))
+
+    # Argument processing
+    _check_arg(data, 'data', (list, _AtomSpace, _Iterator))
+    _check_arg(target, 'target', (str, int, list, _Callable, _Atom))
+    _check_arg(mode, 'mode', str, ['include', 'exclude'])
+    _check_arg(cache, 'cache', bool)
+
+    # Filter lazily: the selection or everything else
+    if mode == 'include':
+        return _iter_filtered(data, target, cache)
+    return _filterfalse(_prepare_filter_func(target, cache), data)
+
+
+def _iter_filtered(data, target, cache=False):
+    """Iterate over the Atoms of the given data that are selected by a target."""
+    return _builtins.filter(_prepare_filter_func(target, cache), data)
+
+
+def _select_by_type(atomspace, target):
+    """Select Atoms of given types directly in an AtomSpace, or return None if not possible.
+
+    The target can be a type, a type name or a list of them. A type name also matches
+    the names of Nodes, therefore those are collected in a single extra pass.
+
+    """
+    type_ids = _type_ids()
+    types = []
+    names = set()
+    for x in (target if isinstance(target, list) else [target]):
+        if isinstance(x, str):
+            x = x.lower()
+            if x not in type_ids:
+                return None
+            types.append(type_ids[x])
+            names.add(x)
+        elif isinstance(x, int):
+            types.append(x)
+        else:
+            return None
+    # match: type
+    atoms = {}
+    for type_id in types:
+        atoms.update(dict.fromkeys(atomspace.get_atoms_by_type(type_id, subtype=False)))
+    # match: name (only Nodes have names)
+    if names:
+        for atom in atomspace.get_atoms_by_type(_types.Node, subtype=True):
+            if atom.name.lower() in names:
+                atoms[atom] = None
+    return list(atoms)
+
+
+def _prepare_filter_func(target, cache=False):
     """Create a filter function depending on the type of the given target."""
     if isinstance(target, str):
         target = target.lower()
-
-        def func(atom):
-            # match: name, type name
-            return atom.name.lower() == target \
-                or atom.type_name.lower() == target
+        type_id = _type_ids().get(target)
+        if type_id is None:
+            def func(atom):
+                # match: name, type name
+                return atom.name.lower() == target \
+                    or atom.type_name.lower() == target
+        else:
+            def func(atom):
+                # match: type (resolved from the type name once), name
+                return int(atom.type) == type_id \
+                    or atom.name.lower() == target
     elif isinstance(target, int):
         def func(atom):
             # match: type
             return int(atom.type) == target
     elif isinstance(target, list):
-        target = set(x.lower() if isinstance(x, str) else x for x in target)
+        # split the targets once, so that each Atom needs only a few set lookups
+        type_ids = _type_ids()
+        types = set()
+        names = set()
+        type_names = set()
+        atoms = set()
+        for x in target:
+            if isinstance(x, str):
+                x = x.lower()
+                names.add(x)
+                if x in type_ids:
+                    types.add(type_ids[x])
+                else:
+                    type_names.add(x)
+            elif isinstance(x, _Atom):
+                atoms.add(x)
+            else:
+                types.add(x)
+        types = frozenset(types)
+        names = frozenset(names)
+        type_names = frozenset(type_names)
+        atoms = frozenset(atoms)
 
         def func(atom):
-            # match: name, type name, type, atom
-            return atom.type_name.lower() in target or \
-                atom.name.lower() in target or \
-                int(atom.type) in target or \
-                atom in target
+            # match: type (an int compare covers all resolved type names), name,
+            # unresolved type name, atom - empty groups are skipped without any work
+            if int(atom.type) in types:
+                return True
+            if names and atom.name.lower() in names:
+                return True
+            if type_names and atom.type_name.lower() in type_names:
+                return True
+            return bool(atoms) and atom in atoms
     elif isinstance(target, _Callable):
         func = target
+        if cache:
+            try:
+                func = _cached_predicate(target)
+            except TypeError:
+                # unhashable Callables can not be cached
+                pass
     return func
 
 
+@_lru_cache(maxsize=8)
+def _cached_predicate(target):
+    """Wrap a user-defined filter function so that its result for each Atom is remembered.
+
+    The wrapper itself is cached too, so that it is reused by subsequent filter calls
+    with the same function. Atoms are hashable by their handle.
+
+    """
+    return _lru_cache(maxsize=None)(target)
+
+
+@_lru_cache(maxsize=1)
+def _type_ids():
+    """Map the lowercase name of each OpenCog Atom type to its type id."""
+    return {name.lower(): value for name, value in vars(_types).items()
+            if not name.startswith('_') and isinstance(value, int)}
+
+
 def _expand(atoms, context, context_size):
     """Expand a list of atoms depending on the type of context that shall be included."""
     if context == 'in':
         # Add all Atoms in the incoming neighborhood of an Atom, repeat it if context size > 1
-        for _ in range(context_size):
-            expansion = set()
-            for atom in atoms:
-                expansion.add(atom)
-                expansion.update(atom.incoming)
-            atoms = list(expansion)
+        atoms = _expand_frontier(atoms, context_size, True, False)
     elif context == 'out':
         # Add all Atoms in the outgoing neighborhood of an Atom, repeat it if context size > 1
-        for _ in range(context_size):
-            expansion = set()
-            for atom in atoms:
-                expansion.add(atom)
-                expansion.update(atom.out)
-            atoms = list(expansion)
+        atoms = _expand_frontier(atoms, context_size, False, True)
     elif context == 'both':
         # Add all Atoms in the neighborhood of an Atom, repeat it if context size > 1
-        for _ in range(context_size):
-            expansion = set()
-            for atom in atoms:
-                expansion.add(atom)
-                expansion.update(atom.incoming)
-                expansion.update(atom.out)
-            atoms = list(expansion)
+        atoms = _expand_frontier(atoms, context_size, True, True)
     elif context == 'in-tree':
         # Add all Atoms in the incoming neighborhood of an Atom, repeat it until all is reached
-        expansion = set()
-        for atom in atoms:
-            expansion = expansion.union(_dfs_in(atom))
-        atoms = list(expansion)
+        atoms = _expand_frontier(atoms, None, True, False)
     elif context == 'out-tree':
         # Add all Atoms in the outgoing neighborhood of an Atom, repeat it until all is reached
-        expansion = set()
-        for atom in atoms:
-            expansion = expansion.union(_dfs_out(atom))
-        atoms = list(expansion)
+        atoms = _expand_frontier(atoms, None, False, True)
     return atoms
 
 
+def _expand_frontier(atoms, context_size, incoming, outgoing):
+    """Expand a list of atoms by their neighbors a given number of times.
+
+    Only the Atoms that were newly added in the previous step form the frontier of
+    the next one, because the neighbors of all others are already included.
+    A context size of None repeats the expansion until nothing new is reached.
+    The neighbors are collected and compared with set operations, so that the
+    loops over individual Atoms run inside the interpreter's C code.
+
+    """
+    if context_size is not None and context_size < 1:
+        return atoms
+    # - duplicate seeds are dropped once, the first frontier can share the seed set,
+    #   because it is fully iterated before the visited set grows
+    visited = set(atoms)
+    frontier = visited
+    step = 0
+    while frontier and (context_size is None or step < context_size):
+        reached = set()
+        for atom in frontier:
+            if incoming:
+                reached.update(atom.incoming)
+            if outgoing:
+                reached.update(atom.out)
+        reached -= visited
+        visited |= reached
+        frontier = reached
+        step += 1
+    return list(visited)
+
+
 def _include_or_exclude(selected, given, mode):
     """Include or exclude the selected Atoms from the initially given Atoms."""
     if mode == 'exclude':
+        selected = set(selected)
         selected = [atom for atom in given if atom not in selected]
     return selected
-
-
-def _dfs_out(atom):
-    """Traverse an Atom's outgoing neighborhood iteratively with a depth-first search."""
-    atoms = [atom]
-    stack = list(atom.out)
-    while stack:
-        atom = stack.pop(0)
-        atoms.append(atom)
-        stack[0:0] = atom.out
-    return atoms
-
-
-def _dfs_in(atom):
-    """Traverse an Atom's incoming neighborhood iteratively with a depth-first search."""
-    atoms = [atom]
-    stack = list(atom.incoming)
-    while stack:
-        atom = stack.pop(0)
-        atoms.append(atom)
-        stack[0:0] = atom.incoming
-    return atoms
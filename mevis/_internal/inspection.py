@@ -1,10 +1,16 @@
+import hashlib as _hashlib
+import math as _math
+from collections import Counter as _Counter
+from functools import lru_cache as _lru_cache
+
 import networkx as _nx
+from opencog.atomspace import types as _types
 from opencog.type_constructors import AtomSpace as _AtomSpace
 
 from .args import check_arg as _check_arg
 
 
-def inspect(data, count_details=True):
+def inspect(data, count_details=True, approx=False):
     """Inspect an AtomSpace or graph by counting elements.
 
     Parameters
@@ -12,6 +18,12 @@ def inspect(data, count_details=True):
     data : AtomSpace, list of Atoms, NetworkX Graph, NetworkX DiGraph
     count_details : bool
         If ``True``, some detailed properties of the AtomSpace or Graph are counted.
+    approx : bool
+        If ``True``, the numbers of distinct annotation values of a Graph are estimated
+        with a HyperLogLog sketch instead of being counted exactly. This needs a small,
+        fixed amount of memory per annotation instead of storing all distinct values,
+        which matters for large graphs with many different values. The typical error
+        is about 1%.
 
     Returns
     -------
@@ -27,31 +39,31 @@ def inspect(data, count_details=True):
     """
     # Argument processing
     _check_arg(data, 'data', (list, _AtomSpace, _nx.Graph, _nx.DiGraph))
+    _check_arg(approx, 'approx', bool)
 
     # Inspection
     if isinstance(data, (list, _AtomSpace)):
         stats = inspect_atomspace(data, count_details)
     else:
-        stats = inspect_graph(data, count_details)
+        stats = inspect_graph(data, count_details, approx)
     return stats
 
 
 def inspect_atomspace(data, count_details):
+    if isinstance(data, _AtomSpace):
+        return inspect_atomspace_by_type(data, count_details)
     if count_details:
         # Count
+        # - type names are collected in one pass and counted by Counter in C
         num_nodes = 0
-        num_links = 0
-        num_types = dict()
+        type_names = []
+        add_type_name = type_names.append
         for atom in data:
+            add_type_name(atom.type_name)
             if atom.is_node():
                 num_nodes += 1
-            else:
-                num_links += 1
-            key = atom.type_name
-            try:
-                num_types[key] += 1
-            except KeyError:
-                num_types[key] = 1
+        num_links = len(type_names) - num_nodes
+        num_types = dict(_Counter(type_names))
         # Combine
         stats = dict(
             atoms=num_nodes+num_links,
@@ -77,29 +89,41 @@ def inspect_atomspace(data, count_details):
     return stats
 
 
-def inspect_graph(data, count_details):
+def inspect_atomspace_by_type(atomspace, count_details):
+    # Count
+    # - the AtomSpace selects Atoms by type itself, so there is no Python call per Atom
+    num_nodes = len(atomspace.get_atoms_by_type(_types.Node, subtype=True))
+    num_links = len(atomspace.get_atoms_by_type(_types.Link, subtype=True))
+    stats = dict(
+        atoms=num_nodes+num_links,
+        nodes=num_nodes,
+        links=num_links,
+    )
+    if count_details:
+        num_types = dict()
+        for type_id, type_name in _type_names().items():
+            num = len(atomspace.get_atoms_by_type(type_id, subtype=False))
+            if num > 0:
+                num_types[type_name] = num
+        stats['types'] = num_types
+    return stats
+
+
+@_lru_cache(maxsize=1)
+def _type_names():
+    """Map the id of each OpenCog Atom type to its name."""
+    return {value: name for name, value in vars(_types).items()
+            if not name.startswith('_') and isinstance(value, int)}
+
+
+def inspect_graph(data, count_details, approx=False):
     if count_details:
         # Count
         num_nodes = len(data.nodes)
         num_edges = len(data.edges)
-        node_cnt = dict()
-        for name in data.nodes:
-            for key, val in data.nodes[name].items():
-                try:
-                    node_cnt[key].add(val)
-                except KeyError:
-                    node_cnt[key] = set([val])
-        for key in node_cnt:
-            node_cnt[key] = len(node_cnt[key])
-        edge_cnt = dict()
-        for n1, n2 in data.edges:
-            for key, val in data.edges[n1, n2].items():
-                try:
-                    edge_cnt[key].add(val)
-                except KeyError:
-                    edge_cnt[key] = set([val])
-        for key in edge_cnt:
-            edge_cnt[key] = len(edge_cnt[key])
+        # - attribute dicts are read from the data views, without a lookup per element
+        node_cnt = _count_properties([attrs for _, attrs in data.nodes(data=True)], approx)
+        edge_cnt = _count_properties([attrs for _, _, attrs in data.edges(data=True)], approx)
         # Combine
         stats = dict(
             nodes=num_nodes,
@@ -117,3 +141,95 @@ def inspect_graph(data, count_details):
             edges=num_edges,
         )
     return stats
+
+
+def _count_properties(attr_dicts, approx=False):
+    """Count the distinct values of each property in a list of attribute dicts.
+
+    The values are gathered column by column, one property at a time, so that
+    an exact count is a single set construction instead of a method call per value.
+
+    """
+    # - property names in the order of the first element, followed by any others
+    keys = dict.fromkeys(attr_dicts[0]) if attr_dicts else {}
+    keys.update(dict.fromkeys(set().union(*attr_dicts)))
+    counts = {}
+    for key in keys:
+        if not approx:
+            try:
+                values = {attrs.get(key, _MISSING) for attrs in attr_dicts}
+                values.discard(_MISSING)
+                counts[key] = len(values)
+                continue
+            except TypeError:
+                # unhashable values are counted one by one
+                pass
+        counter = _HyperLogLog() if approx else _DistinctValues()
+        for attrs in attr_dicts:
+            val = attrs.get(key, _MISSING)
+            if val is not _MISSING:
+                counter.add(val)
+        counts[key] = counter.count()
+    return counts
+
+
+class _DistinctValues:
+    """Exact count of distinct values, which tolerates unhashable values."""
+
+    __slots__ = ('_values', )
+
+    def __init__(self):
+        self._values = set()
+
+    def add(self, val):
+        try:
+            self._values.add(val)
+        except TypeError:
+            self._values.add(repr(val))
+
+    def count(self):
+        return len(self._values)
+
+
+class _HyperLogLog:
+    """Approximate count of distinct values with a HyperLogLog sketch of fixed size.
+
+    References
+    ----------
+    - Flajolet et al. (2007): HyperLogLog: the analysis of a near-optimal
+      cardinality estimation algorithm
+
+    """
+
+    __slots__ = ('_registers', )
+
+    _P = 14
+    _M = 1 << _P
+    _W = 64 - _P
+
+    def __init__(self):
+        self._registers = bytearray(self._M)
+
+    def add(self, val):
+        # a digest of the repr is the same in every process, unlike hash() of a str
+        digest = _hashlib.blake2b(repr(val).encode(), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        # first bits select a register, the remaining ones give the rank
+        idx = h >> self._W
+        rank = self._W - (h & ((1 << self._W) - 1)).bit_length() + 1
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def count(self):
+        m = self._M
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        num_zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and num_zeros > 0:
+            # small range correction: linear counting
+            estimate = m * _math.log(m / num_zeros)
+        return int(round(estimate))
+
+
+# Placeholder for a property that an element does not have
+_MISSING = object()
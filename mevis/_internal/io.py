@@ -1,4 +1,6 @@
+import bz2 as _bz2
 import errno as _errno
+import gzip as _gzip
 import os as _os
 
 import networkx as _nx
@@ -67,18 +69,19 @@ def load(filepath, method='primitive', verbose=False):
     if not _os.path.isfile(filepath):
         raise FileNotFoundError(_errno.ENOENT, _os.strerror(_errno.ENOENT), filepath)
 
-    # Create Atomspace and load modules
+    # Load modules and create Atomspace
+    # - the file is read ahead by the OS in the meantime, so that Guile finds it cached
+    _prefetch_file(filepath)
+    _ensure_modules_loaded()
     atomspace = _AtomSpace()
-    _load_all_modules(atomspace)
 
     # Import from file
     if method == 'basic':
-        _scheme_eval(atomspace, '(load "{}")'.format(filepath))
+        _scheme_eval(atomspace, '(load {})'.format(_to_scheme_string(filepath)))
     elif method == 'primitive':
-        _scheme_eval(atomspace, '(primitive-load "{}")'.format(filepath))
+        _scheme_eval(atomspace, '(primitive-load {})'.format(_to_scheme_string(filepath)))
     elif method == 'fast':
-        _try_scheme_eval(atomspace, '(use-modules (opencog persist-file))')
-        _scheme_eval(atomspace, '(load-file "{}")'.format(filepath))
+        _scheme_eval(atomspace, '(load-file {})'.format(_to_scheme_string(filepath)))
     elif method == 'python':
         _load_file(filepath, atomspace)
 
@@ -128,16 +131,13 @@ def store(atomspace, filepath, method='basic', verbose=False, overwrite=False):
         check_if_file_exists(filepath)
 
     # Load modules
-    _load_storage_modules(atomspace)
+    _ensure_modules_loaded()
 
     # Export to file
     if method == 'basic':
-        _scheme_eval(atomspace, '(export-all-atoms "{}")'.format(filepath))
+        _scheme_eval(atomspace, '(export-all-atoms {})'.format(_to_scheme_string(filepath)))
     elif method == 'file-storage-node':
-        _scheme_eval(atomspace, '(define fsn (FileStorageNode "{}"))'.format(filepath))
-        _scheme_eval(atomspace, '(cog-open fsn)')
-        _scheme_eval(atomspace, '(store-atomspace fsn)')
-        _scheme_eval(atomspace, '(cog-close fsn)')
+        _scheme_eval(atomspace, _STORE_WITH_FSN.format(_to_scheme_string(filepath)))
 
     # Report
     if verbose:
@@ -185,7 +185,51 @@ def export(graph, filepath, overwrite=False):
         check_if_file_exists(filepath)
 
     # Export
-    _nx.readwrite.gml.write_gml(graph, filepath)
+    if filepath.endswith('.gml.gz'):
+        file = _gzip.open(filepath, 'wb', compresslevel=6)
+    elif filepath.endswith('.gml.bz2'):
+        file = _bz2.open(filepath, 'wb')
+    else:
+        file = open(filepath, 'wb', buffering=_WRITE_BUFFER_SIZE)
+    with file:
+        _write_gml(graph, file)
+
+
+def _write_gml(graph, file, lines_per_write=4096):
+    """Stream the lines of a GML representation to a binary file in large blocks.
+
+    The GML text is never held completely in memory, but writing each line separately
+    is avoided, which would be slow in particular for compressed files.
+
+    """
+    lines = []
+    add_line = lines.append
+    for line in _nx.readwrite.gml.generate_gml(graph):
+        add_line(line)
+        if len(lines) >= lines_per_write:
+            lines.append('')
+            file.write('\n'.join(lines).encode('ascii'))
+            lines.clear()
+    if lines:
+        lines.append('')
+        file.write('\n'.join(lines).encode('ascii'))
+
+
+def _to_scheme_string(text):
+    """Create a Scheme string literal, so that quotes and backslashes in a filepath are kept."""
+    return '"{}"'.format(text.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def _use_modules_code(modules):
+    """Create Scheme code that loads several modules in one evaluation.
+
+    Each module is loaded on its own with ``false-if-exception``, so that a missing one
+    does not prevent the others from being loaded, like separate ``use-modules`` calls.
+
+    """
+    parts = ["(false-if-exception (module-use! (current-module) (resolve-interface '({}))))"
+             .format(module) for module in modules]
+    return '(begin {})'.format(' '.join(parts))
 
 
 def _try_scheme_eval(atomspace, code):
@@ -196,8 +240,41 @@ def _try_scheme_eval(atomspace, code):
         pass
 
 
+def _prefetch_file(filepath):
+    """Ask the operating system to read a file into the page cache in the background.
+
+    This is only a hint and does nothing on platforms without ``posix_fadvise``.
+
+    """
+    if not hasattr(_os, 'posix_fadvise'):
+        return
+    try:
+        fd = _os.open(filepath, _os.O_RDONLY)
+        try:
+            _os.posix_fadvise(fd, 0, 0, _os.POSIX_FADV_WILLNEED)
+        finally:
+            _os.close(fd)
+    except OSError:
+        pass
+
+
+def _ensure_modules_loaded():
+    """Load OpenCog modules that are often used, but only once per process.
+
+    Guile modules stay loaded after the first time, so later calls do nothing.
+    The modules are loaded with a throwaway Atomspace, because some of them add Atoms,
+    e.g. miner introduces three (LambdaLink, PresentLink, VariableNode), which therefore
+    never show up in an Atomspace that is loaded or stored.
+
+    """
+    global _MODULES_LOADED
+    if not _MODULES_LOADED:
+        _load_all_modules(_AtomSpace())
+        _MODULES_LOADED = True
+
+
 def _load_all_modules(atomspace):
-    """Load OpenCog modules that are often used and cleanup the Atomspace.
+    """Load OpenCog modules that are often used.
 
     References
     ----------
@@ -205,31 +282,7 @@ def _load_all_modules(atomspace):
     - https://github.com/opencog/rocca/blob/master/rocca/agents/core.py
 
     """
-    cmds = (
-        '(use-modules (opencog))',
-        '(use-modules (opencog persist))',
-        '(use-modules (opencog persist-file))',
-        '(use-modules (opencog bioscience))',
-        '(use-modules (opencog spacetime))',
-        '(use-modules (opencog miner))',
-        '(use-modules (opencog pln))',
-    )
-    for cmd in cmds:
-        _try_scheme_eval(atomspace, cmd)
-
-    # Remove Atoms, e.g. miner introduces three (LambdaLink, PresentLink, VariableNode)
-    atomspace.clear()
-
-
-def _load_storage_modules(atomspace):
-    """Load OpenCog modules that might be required for storing an Atomspace to a file."""
-    cmds = (
-        '(use-modules (opencog))',
-        '(use-modules (opencog persist))',
-        '(use-modules (opencog persist-file))',
-    )
-    for cmd in cmds:
-        _try_scheme_eval(atomspace, cmd)
+    _try_scheme_eval(atomspace, _ALL_MODULES_CODE)
 
 
 def check_if_file_exists(filepath):
@@ -242,3 +295,18 @@ def check_if_file_exists(filepath):
     """
     if _os.path.isfile(filepath):
         raise FileExistsError(_errno.EEXIST, _os.strerror(_errno.EEXIST), filepath)
+
+
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Scheme code fragments that are only created once
+_ALL_MODULES_CODE = _use_modules_code((
+    'opencog', 'opencog persist', 'opencog persist-file',
+    'opencog bioscience', 'opencog spacetime', 'opencog miner', 'opencog pln'))
+_MODULES_LOADED = False
+_STORE_WITH_FSN = (
+    '(begin'
+    ' (define fsn (FileStorageNode {}))'
+    ' (cog-open fsn)'
+    ' (store-atomspace fsn)'
+    ' (cog-close fsn))')
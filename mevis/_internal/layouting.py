@@ -1,7 +1,21 @@
+import hashlib as _hashlib
+import importlib.util as _importlib_util
+import json as _json
+import os as _os
+import shutil as _shutil
+import subprocess as _subprocess
+import threading as _threading
+from collections import OrderedDict as _OrderedDict
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from functools import lru_cache as _lru_cache
+from itertools import chain as _chain
+
 import networkx as _nx
+import numpy as _np
 from opencog.type_constructors import AtomSpace as _AtomSpace
 
 from .args import check_arg as _check_arg
+from .args import check_args as _check_args
 from .conversion import convert as _convert
 
 
@@ -9,11 +23,12 @@ GRAPHVIZ_METHODS = ['dot', 'neato', 'twopi', 'circo', 'fdp', 'sfdp']
 NETWORKX_METHODS = [
     'bipartite', 'circular', 'kamada_kawai', 'planar', 'random', 'shell', 'spring',
     'spectral', 'spiral']
-LAYOUT_METHODS = GRAPHVIZ_METHODS + NETWORKX_METHODS
+SCIPY_METHODS = ['spring_lbfgs']
+LAYOUT_METHODS = GRAPHVIZ_METHODS + NETWORKX_METHODS + SCIPY_METHODS
 
 
 def layout(data, method='neato', scale_x=1.0, scale_y=1.0, mirror_x=False, mirror_y=True,
-           center_x=True, center_y=True, **kwargs):
+           center_x=True, center_y=True, cache_dir=None, **kwargs):
     """Calculate a layout for a given NetworkX graph with a chosen method.
 
     Parameters
@@ -70,6 +85,12 @@ def layout(data, method='neato', scale_x=1.0, scale_y=1.0, mirror_x=False, mirro
             - ``spring``: using Fruchterman-Reingold force-directed algorithm,
               see `spring_layout <https://networkx.org/documentation/stable/reference/generated/networkx.drawing.layout.spring_layout.html>`__
 
+        - SciPy layouts
+
+            - ``spring_lbfgs``: spring model layout for larger graphs, minimizes the
+              Fruchterman-Reingold energy with the L-BFGS-B optimizer of
+              `SciPy <https://docs.scipy.org/doc/scipy/reference/optimize.minimize-lbfgsb.html>`__
+
     scale_x : int, float
         A number to contract or stretch the layout along the x coordinate.
     scale_y : int, float
@@ -82,6 +103,12 @@ def layout(data, method='neato', scale_x=1.0, scale_y=1.0, mirror_x=False, mirro
         if ``True``, the x coordinates are shifted so the extreme values have equal distance to 0.
     center_y : bool
         if ``True``, the y coordinates are shifted so the extreme values have equal distance to 0.
+    cache_dir : str, optional
+        If a directory is given, the calculated coordinates are stored there as JSON file,
+        named by a hash of the graph, its attributes, the method and keyword arguments.
+        A later call with the same input reads the file instead of calculating the layout
+        again, also in another Python session. Note that layouts with random elements,
+        e.g. ``spring`` without ``seed``, are also reused.
     kwargs
         Other keyword arguments are forwarded to the layout method.
 
@@ -103,57 +130,485 @@ def layout(data, method='neato', scale_x=1.0, scale_y=1.0, mirror_x=False, mirro
 
     """
     # Argument processing
-    _check_arg(data, 'data', (_nx.Graph, _nx.DiGraph, _AtomSpace, list))
-    _check_arg(method, 'method', str, LAYOUT_METHODS)
-    _check_arg(scale_x, 'scale_x', (int, float))
-    _check_arg(scale_y, 'scale_y', (int, float))
-    _check_arg(mirror_x, 'mirror_x', bool)
-    _check_arg(mirror_y, 'mirror_y', bool)
-    _check_arg(center_x, 'center_x', bool)
-    _check_arg(center_y, 'center_y', bool)
+    _check_args(
+        (data, method, scale_x, scale_y, mirror_x, mirror_y, center_x, center_y, cache_dir),
+        _LAYOUT_ARG_SPEC)
 
     # Optional conversion
     if isinstance(data, (_AtomSpace, list)):
         data = _convert(data)
 
-    # Calculate layout
-    positions = calc_layout(data, method, kwargs)
+    # Calculate layout, or read it from a cache file
+    if cache_dir is None:
+        positions = calc_layout(data, method, kwargs)
+    else:
+        positions = calc_layout_with_file_cache(data, method, kwargs, cache_dir)
 
     # Annotate graph
     data = annotate(data, positions, mirror_x, mirror_y, center_x, center_y, scale_x, scale_y)
     return data
 
 
+def layout_many(data, methods, scale_x=1.0, scale_y=1.0, mirror_x=False, mirror_y=True,
+                center_x=True, center_y=True, **kwargs):
+    """Calculate several layouts for a given NetworkX graph in parallel.
+
+    This works like :func:`layout` for each of the given methods. The data is converted
+    only once and each layout is calculated on a copy of the graph in a thread pool,
+    so that the Graphviz programs of different methods run at the same time.
+
+    Parameters
+    ----------
+    data : NetworkX Graph, NetworkX DiGraph, AtomSpace, list of Atoms
+        Input that gets augmented by a layout, see :func:`layout`.
+        A given graph is not modified.
+    methods : list of str
+        Layout methods, see ``method`` in :func:`layout` for possible values.
+    scale_x, scale_y, mirror_x, mirror_y, center_x, center_y
+        Same as in :func:`layout`, applied to each layout.
+    kwargs
+        Other keyword arguments are forwarded to each layout method.
+
+    Returns
+    -------
+    graphs : dict
+        Maps each layout method to a NetworkX Graph or DiGraph annotated with its layout.
+
+    """
+    # Argument processing
+    _check_arg(data, 'data', (_nx.Graph, _nx.DiGraph, _AtomSpace, list))
+    _check_arg(methods, 'methods', list)
+    for method in methods:
+        _check_arg(method, 'method', str, LAYOUT_METHODS)
+
+    # Optional conversion, only once for all layouts
+    if isinstance(data, (_AtomSpace, list)):
+        data = _convert(data)
+
+    # Calculate layouts
+    if not methods:
+        return {}
+    max_workers = min(len(methods), _os.cpu_count() or 1)
+    with _ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            method: executor.submit(
+                layout, data.copy(), method, scale_x, scale_y, mirror_x, mirror_y,
+                center_x, center_y, **kwargs)
+            for method in methods}
+    return {method: future.result() for method, future in futures.items()}
+
+
 def calc_layout(graph, method, kwargs):
     """Calculate x and y coordinates for each node in the given graph with the chosen method."""
-    if method in GRAPHVIZ_METHODS:
+    if len(graph) == 0:
+        # An empty graph has no coordinates, no need to start Graphviz or NetworkX
+        return {}
+    if method in _CACHED_METHOD_SET and len(graph) <= _LAYOUT_CACHE_MAX_SIZE:
+        # Graphviz layouts and costly deterministic NetworkX layouts are the same for a given
+        # graph, method and arguments, so they are cached to avoid calculating them again,
+        # e.g. when only scaling, mirroring or centering changes, unless a value is unhashable
+        try:
+            key = _layout_key(graph, method, kwargs)
+            hash(key)
+        except TypeError:
+            pass
+        else:
+            with _LAYOUT_CACHE_LOCK:
+                entry = _LAYOUT_CACHE.get(key)
+                if entry is not None:
+                    _LAYOUT_CACHE.move_to_end(key)
+                    return dict(entry[0])
+            pos = calc_uncached_layout(graph, method, kwargs)
+            _store_layout(key, pos, len(graph) + graph.number_of_edges())
+            return pos
+    return calc_uncached_layout(graph, method, kwargs)
+
+
+def calc_uncached_layout(graph, method, kwargs):
+    """Calculate the coordinates of a layout without looking them up in the memory cache."""
+    if method in _GRAPHVIZ_METHOD_SET:
         # Calculate a Graphviz layout
-        pos = _nx.nx_agraph.graphviz_layout(graph, method, **kwargs)
+        return graphviz_layout(graph, method, **kwargs)
+
+    # Prepare a NetworkX or SciPy layout
+    function = _LAYOUT_FUNCTIONS[method]
+    if method == 'bipartite':
+        kwargs = prepare_bipartite(graph, kwargs)
+    elif method == 'shell':
+        kwargs = prepare_shell(graph, kwargs)
+    elif method == 'planar':
+        # Test planarity up front for a clear error, its embedding is used as input
+        is_planar, embedding = _nx.check_planarity(graph)
+        if not is_planar:
+            raise ValueError('Layout method "planar" requires a planar graph.')
+        graph = embedding
+    elif method == 'spring' and len(graph) >= 500 and set(kwargs) <= _SPRING_KWARGS:
+        # Large graphs: NetworkX would update one node at a time in a Python loop
+        function = spring_layout
+
+    # Calculate a NetworkX or SciPy layout
+    pos = function(graph, **kwargs)
+
+    # Pre-scale it to become roughly compatible with plotting without user-provided scaling
+    # - the coordinates of all nodes are stacked into one array and scaled at once
+    coords = _np.array(list(pos.values()), dtype=_np.float64).reshape(-1, 2) * 300.0
+    return dict(zip(pos, map(tuple, coords.tolist())))
+
+
+def calc_layout_with_file_cache(graph, method, kwargs, cache_dir):
+    """Calculate a layout or read it from a JSON file in a cache directory."""
+    # Filename from a hash of everything that the layout depends on
+    description = repr((
+        method,
+        sorted(kwargs.items()),
+        graph.is_directed(),
+        graph.is_multigraph(),
+        list(graph.nodes(data=True)),
+        list(graph.edges(data=True)),
+    ))
+    key = _hashlib.sha256(description.encode('utf-8')).hexdigest()
+    filepath = _os.path.join(cache_dir, key + '.json')
+
+    # Read: the coordinates are stored in the order of the nodes, which is part of the key
+    if _os.path.isfile(filepath):
+        with open(filepath) as file:
+            coords = _json.load(file)
+        return dict(zip(graph.nodes, coords))
+
+    # Calculate and write: via a temporary file, so that no partial file can be read
+    pos = calc_layout(graph, method, kwargs)
+    coords = [[float(x), float(y)] for x, y in (pos[node] for node in graph.nodes)]
+    _os.makedirs(cache_dir, exist_ok=True)
+    temp_filepath = '{}.{}.{}.tmp'.format(filepath, _os.getpid(), _threading.get_ident())
+    with open(temp_filepath, 'w') as file:
+        _json.dump(coords, file)
+    _os.replace(temp_filepath, filepath)
+    return pos
+
+
+def _layout_key(graph, method, kwargs):
+    """Describe the structure of a graph and the attributes that affect its layout."""
+    if method in _GRAPHVIZ_METHOD_SET:
+        graph_attrs = tuple(sorted(graph.graph.items()))
+        node_names = _GRAPHVIZ_NODE_ATTRS
+        edge_names = _GRAPHVIZ_EDGE_ATTRS
     else:
-        # Prepare a NetworkX layout
-        function = getattr(_nx.drawing.layout, method + '_layout')
-        if method == 'bipartite':
-            kwargs = prepare_bipartite(graph, kwargs)
-        elif method == 'shell':
-            kwargs = prepare_shell(graph, kwargs)
-
-        # Calculate a NetworkX layout
-        pos = function(graph, **kwargs)
-
-        # Pre-scale it to become roughly compatible with plotting without user-provided scaling
-        pos = {node: (x*300, y*300) for node, (x, y) in pos.items()}
+        graph_attrs = ()
+        node_names = ()
+        edge_names = (kwargs.get('weight', 'weight'), )
+    # - only a few attributes are selected, in the order in which they were added
+    return (
+        method,
+        tuple(sorted(kwargs.items())),
+        graph.is_directed(),
+        graph.is_multigraph(),
+        graph_attrs,
+        tuple((node, tuple((name, val) for name, val in attrs.items() if name in node_names))
+              for node, attrs in graph.nodes(data=True)),
+        tuple((source, target,
+               tuple((name, val) for name, val in attrs.items() if name in edge_names))
+              for source, target, attrs in graph.edges(data=True)),
+    )
+
+
+def _store_layout(key, pos, size):
+    """Add a layout to the memory cache and drop the least recently used ones if it is full.
+
+    The size of an entry is the number of nodes and edges of its graph.
+
+    """
+    global _LAYOUT_CACHE_SIZE
+    with _LAYOUT_CACHE_LOCK:
+        if key in _LAYOUT_CACHE:
+            return
+        _LAYOUT_CACHE[key] = (tuple(pos.items()), size)
+        _LAYOUT_CACHE_SIZE += size
+        while _LAYOUT_CACHE_SIZE > _LAYOUT_CACHE_MAX_SIZE:
+            _, (_, old_size) = _LAYOUT_CACHE.popitem(last=False)
+            _LAYOUT_CACHE_SIZE -= old_size
+
+
+def graphviz_layout(graph, method, root=None, args=''):
+    """Calculate a Graphviz layout with PyGraphviz via NetworkX if it is available.
+
+    PyGraphviz calculates the layout in the same process. Without it, the Graphviz
+    program is run in a subprocess if it can be found.
+
+    """
+    if not _has_pygraphviz() and _shutil.which(method) is not None:
+        return _fast_graphviz_layout(graph, method, root, args)
+    return _nx.nx_agraph.graphviz_layout(graph, method, root=root, args=args)
+
+
+@_lru_cache(maxsize=1)
+def _has_pygraphviz():
+    """Check once whether PyGraphviz can be imported."""
+    return _importlib_util.find_spec('pygraphviz') is not None
+
+
+def _fast_graphviz_layout(graph, method, root=None, args=''):
+    """Calculate a Graphviz layout by piping DOT code to the Graphviz program.
+
+    The graph is written as DOT text with the same attributes that NetworkX would pass
+    to PyGraphviz, and only the node positions are read from the plain output format,
+    so that no intermediate graph object is built on either side.
+
+    """
+    # Nodes get simple names, so that they need no escaping and are easy to map back
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    # Command
+    command = [method, '-Tplain'] + args.split()
+    if root is not None:
+        command.append('-Groot={}'.format('n{}'.format(index[root]) if root in index else root))
+
+    # Run Graphviz
+    dot = _to_dot(graph, index)
+    result = _subprocess.run(
+        command, input=dot.encode('utf-8'), stdout=_subprocess.PIPE, stderr=_subprocess.PIPE)
+    if result.returncode != 0:
+        message = 'Graphviz program "{}" failed: {}'.format(
+            method, result.stderr.decode('utf-8', 'replace').strip())
+        raise ValueError(message)
+
+    # Parse node lines: node name x y width height ..., where coordinates are in inches
+    pos = {}
+    for line in result.stdout.decode('utf-8').splitlines():
+        if line.startswith('node '):
+            _, name, x, y, _ = line.split(' ', 4)
+            pos[nodes[int(name[1:])]] = (float(x) * 72.0, float(y) * 72.0)
     return pos
 
 
+def _to_dot(graph, index):
+    """Write a graph as DOT code with nodes named by their index."""
+    directed = graph.is_directed()
+    # - strict like in networkx.to_agraph, which does not use it if there are self-loops
+    strict = not graph.is_multigraph() and _nx.number_of_selfloops(graph) == 0
+    lines = ['{}{} {{'.format('strict ' if strict else '', 'digraph' if directed else 'graph')]
+    # - graph attributes and defaults for nodes and edges, as in networkx.to_agraph
+    graph_attrs = {key: val for key, val in graph.graph.items()
+                   if key not in ('graph', 'node', 'edge')}
+    graph_attrs.update(graph.graph.get('graph', {}))
+    for kind, attrs in (('graph', graph_attrs), ('node', graph.graph.get('node', {})),
+                        ('edge', graph.graph.get('edge', {}))):
+        if attrs:
+            lines.append('{} [{}];'.format(kind, _to_dot_attrs(attrs)))
+    for node, attrs in graph.nodes(data=True):
+        lines.append('n{} [{}];'.format(index[node], _to_dot_attrs(attrs)))
+    edge_op = '->' if directed else '--'
+    for source, target, attrs in graph.edges(data=True):
+        lines.append('n{} {} n{} [{}];'.format(
+            index[source], edge_op, index[target], _to_dot_attrs(attrs)))
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def _to_dot_attrs(attrs):
+    """Write attributes as a DOT attribute list with quoted strings."""
+    return ', '.join('{}={}'.format(_to_dot_string(key), _to_dot_string(val))
+                     for key, val in attrs.items())
+
+
+def _to_dot_string(value):
+    """Create a DOT string literal from any value."""
+    # - backslashes first, so that a trailing one can not escape the closing quote
+    return '"{}"'.format(str(value).replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def spring_layout(graph, k=None, iterations=50, threshold=1e-4, weight='weight', scale=1,
+                  seed=None):
+    """Calculate a Fruchterman-Reingold layout for a large graph with blocks of nodes.
+
+    This follows the force model, initialization and cooling scheme of NetworkX's
+    ``spring_layout``. Instead of a Python loop over single nodes, the forces are
+    calculated with NumPy for blocks of nodes at once, where the block size keeps the
+    temporary arrays at a few megabytes. SciPy is not required.
+
+    """
+    nodes = list(graph)
+    num_nodes = len(nodes)
+    seed = _nx.utils.create_random_state(seed)
+    if num_nodes == 0:
+        return {}
+    if num_nodes == 1:
+        return {nodes[0]: _np.zeros(2)}
+
+    # Adjacency matrix in CSR form
+    indptr, indices, weights = _adjacency_csr(graph, nodes, weight)
+
+    # Initial positions, optimal distance and temperature
+    # - single precision like the sparse solver that NetworkX uses for 500 or more nodes,
+    #   so that the positions are identical for the same seed
+    pos = _np.asarray(seed.rand(num_nodes, 2), dtype=_np.float32)
+    if k is None:
+        k = _np.sqrt(1.0 / num_nodes)
+    t = max(pos[:, 0].max() - pos[:, 0].min(), pos[:, 1].max() - pos[:, 1].min()) * 0.1
+    dt = t / (iterations + 1)
+
+    # Iterate
+    block_size = max(1, (1 << 20) // num_nodes)
+    displacement = _np.zeros((num_nodes, 2))
+    for _ in range(iterations):
+        for start in range(0, num_nodes, block_size):
+            stop = min(start + block_size, num_nodes)
+            # - difference and distance between the nodes of this block and all others
+            delta = pos[start:stop, _np.newaxis, :] - pos[_np.newaxis, :, :]
+            distance = _np.sqrt((delta ** 2).sum(axis=-1))
+            _np.maximum(distance, 0.01, out=distance)
+            # - adjacency rows of this block
+            adjacency = _adjacency_rows(indptr, indices, weights, start, stop, num_nodes)
+            # - displacement "force"
+            displacement[start:stop] = _np.einsum(
+                'ijk,ij->ik', delta, k * k / distance ** 2 - adjacency * distance / k)
+        # update positions
+        length = _np.sqrt((displacement ** 2).sum(axis=1))
+        length = _np.where(length < 0.01, 0.1, length)
+        delta_pos = displacement * (t / length)[:, _np.newaxis]
+        pos += delta_pos
+        # cool temperature
+        t -= dt
+        if (_np.linalg.norm(delta_pos) / num_nodes) < threshold:
+            break
+    if scale is not None:
+        pos = _nx.rescale_layout(pos, scale=scale)
+    return dict(zip(nodes, pos))
+
+
+def spring_lbfgs_layout(graph, k=None, iterations=50, weight='weight', scale=1, seed=None):
+    """Calculate a spring layout by minimizing an energy function with L-BFGS-B.
+
+    The energy of the Fruchterman-Reingold model is
+    ``sum_edges w * r^3 / (3k) - sum_pairs k^2 * log(r)``, where ``r`` is the distance
+    between two nodes. Its negative gradient are the attractive and repulsive forces.
+    Both are calculated with NumPy for blocks of nodes, and the quasi-Newton optimizer
+    of SciPy needs fewer evaluations than the cooling scheme of the force simulation.
+    SciPy is an optional dependency that can be installed with ``pip install mevis[layout]``.
+
+    References
+    ----------
+    - Hu (2005): Efficient and high quality force-directed graph drawing
+
+    """
+    from scipy.optimize import minimize
+
+    nodes = list(graph)
+    num_nodes = len(nodes)
+    seed = _nx.utils.create_random_state(seed)
+    if num_nodes == 0:
+        return {}
+    if num_nodes == 1:
+        return {nodes[0]: _np.zeros(2)}
+
+    # Adjacency matrix in CSR form, an edge attracts both of its nodes
+    indptr, indices, weights = _adjacency_csr(graph, nodes, weight, both_directions=True)
+    if k is None:
+        k = _np.sqrt(1.0 / num_nodes)
+    energy_and_gradient = _spring_energy_func(indptr, indices, weights, num_nodes, k)
+
+    x0 = seed.rand(num_nodes * 2)
+    result = minimize(energy_and_gradient, x0, jac=True, method='L-BFGS-B',
+                      options=dict(maxiter=iterations))
+    pos = result.x.reshape(-1, 2)
+    if scale is not None:
+        pos = _nx.rescale_layout(pos, scale=scale)
+    return dict(zip(nodes, pos))
+
+
+def _spring_energy_func(indptr, indices, weights, num_nodes, k):
+    """Create a function that returns the energy of flat coordinates and its gradient.
+
+    The adjacency matrix needs to be symmetric, otherwise the gradient is not the
+    derivative of the energy.
+
+    """
+    # - a softened distance keeps energy and gradient finite for coinciding nodes
+    eps2 = (0.01 * k) ** 2
+    block_size = max(1, (1 << 20) // num_nodes)
+
+    def energy_and_gradient(x):
+        pos = x.reshape(-1, 2)
+        energy = 0.0
+        gradient = _np.empty_like(pos)
+        for start in range(0, num_nodes, block_size):
+            stop = min(start + block_size, num_nodes)
+            delta = pos[start:stop, _np.newaxis, :] - pos[_np.newaxis, :, :]
+            dist2 = (delta ** 2).sum(axis=-1) + eps2
+            dist = _np.sqrt(dist2)
+            adjacency = _adjacency_rows(indptr, indices, weights, start, stop, num_nodes)
+            # - each pair and edge appears twice over all rows, hence the factor 0.5
+            energy += 0.5 * ((adjacency * dist2 * dist).sum() / (3.0 * k)
+                             - k * k * 0.5 * _np.log(dist2).sum())
+            gradient[start:stop] = _np.einsum(
+                'ijk,ij->ik', delta, adjacency * dist / k - k * k / dist2)
+        return energy, gradient.ravel()
+
+    return energy_and_gradient
+
+
+def _adjacency_csr(graph, nodes, weight, both_directions=False):
+    """Create the weighted adjacency matrix of a graph in CSR form.
+
+    Weights of parallel edges are summed. With ``both_directions``, an edge of a directed
+    graph also appears in the row of its target node, so that reciprocal edges give a
+    column twice in a row, which is summed by ``_adjacency_rows``.
+
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    adjacencies = [graph.adj]
+    if both_directions and graph.is_directed():
+        adjacencies.append(graph.pred)
+    multigraph = graph.is_multigraph()
+    indptr = [0]
+    indices = []
+    weights = []
+    for node in nodes:
+        for adj in adjacencies:
+            for neighbor, attrs in adj[node].items():
+                if multigraph:
+                    val = sum(data.get(weight, 1) if weight else 1 for data in attrs.values())
+                else:
+                    val = attrs.get(weight, 1) if weight else 1
+                indices.append(index[neighbor])
+                weights.append(val)
+        indptr.append(len(indices))
+    indptr = _np.array(indptr)
+    indices = _np.array(indices, dtype=_np.int64)
+    weights = _np.array(weights, dtype=_np.float32)
+    return indptr, indices, weights
+
+
+def _adjacency_rows(indptr, indices, weights, start, stop, num_nodes):
+    """Create a dense block of rows of an adjacency matrix in CSR form."""
+    adjacency = _np.zeros((stop - start, num_nodes), dtype=_np.float32)
+    rows = _np.repeat(_np.arange(stop - start), _np.diff(indptr[start:stop + 1]))
+    # - a column can occur repeatedly in a row, e.g. for reciprocal edges, so the weights
+    #   are accumulated instead of assigned
+    _np.add.at(
+        adjacency, (rows, indices[indptr[start]:indptr[stop]]),
+        weights[indptr[start]:indptr[stop]])
+    return adjacency
+
+
 def annotate(data, pos, mirror_x, mirror_y, center_x, center_y, scale_x, scale_y):
     """Annotate graph with coordinates from the layout and optional corrections."""
-    nodes = data.nodes
+    if not pos:
+        return data
+    # - all positions form one (N, 2) array, which is shifted, scaled and mirrored at once
+    coords = _np.fromiter(
+        _chain.from_iterable(pos.values()), dtype=_np.float64, count=2 * len(pos))
+    coords = coords.reshape(-1, 2)
     sign_x, sign_y = calc_mirror(mirror_x, mirror_y)
-    shift_x, shift_y = calc_shift(pos, center_x, center_y)
-    for uid, (x, y) in pos.items():
+    shift = calc_shift(coords, center_x, center_y)
+    # - in place, so that no temporary arrays are created, a sign of +-1 keeps scaling exact
+    coords += shift
+    coords *= (scale_x * sign_x, scale_y * sign_y)
+    nodes = data.nodes
+    for uid, (x, y) in zip(pos, coords.tolist()):
         node = nodes[uid]
-        node['x'] = (x + shift_x) * scale_x * sign_x
-        node['y'] = (y + shift_y) * scale_y * sign_y
+        node['x'] = x
+        node['y'] = y
     return data
 
 
@@ -163,44 +618,31 @@ def calc_mirror(mirror_x, mirror_y):
     return sign_x, sign_y
 
 
-def calc_shift(layout, center_x, center_y):
-    """Shift the x and/or y coordinates so they become centered around zero to improve plots."""
-    if not center_x and not center_y:
-        # Shift nothing
-        shift_x = shift_y = 0.0  # shift nothing
-    else:
+def calc_shift(coords, center_x, center_y):
+    """Shift the x and/or y coordinates so they become centered around zero to improve plots.
+
+    The coordinates are given as an array of shape (N, 2) with one row per node.
+
+    """
+    shift_x = shift_y = 0.0  # shift nothing
+    if (center_x or center_y) and len(coords):
         # Shift x and/or y
-        min_x = min_y = float('inf')
-        max_x = max_y = float('-inf')
-        for x, y in layout.values():
-            if x < min_x:
-                min_x = x
-            if x > max_x:
-                max_x = x
-            if y < min_y:
-                min_y = y
-            if y > max_y:
-                max_y = y
+        # - the extreme values come from one vectorized reduction over all coordinates
+        min_x, min_y = coords.min(axis=0).tolist()
+        max_x, max_y = coords.max(axis=0).tolist()
         # Shift x or not
-        if center_x and min_x != float('inf') and max_x != float('-inf'):
+        if center_x:
             shift_x = -min_x - (max_x - min_x) / 2.0
-        else:
-            shift_x = 0.0
         # Shift y or not
-        if center_y and min_y != float('inf') and max_y != float('-inf'):
+        if center_y:
             shift_y = -min_y - (max_y - min_y) / 2.0
-        else:
-            shift_y = 0.0
     return shift_x, shift_y
 
 
 def prepare_bipartite(graph, kwargs):
     """Add a default nodes argument based on color to get a plot with two lines of nodes."""
     try:
-        all_colors = set(vals.get('color', None) for vals in graph.nodes.values())
-        one_color = list(all_colors)[0]
-        nodes_of_one_type = [key for key, vals in graph.nodes.items()
-                             if vals.get('color', None) == one_color]
+        nodes_of_one_type, _ = split_by_color(graph)
     except Exception:
         nodes_of_one_type = graph.nodes
     kwargs['nodes'] = kwargs.get('nodes', nodes_of_one_type)
@@ -210,13 +652,72 @@ def prepare_bipartite(graph, kwargs):
 def prepare_shell(graph, kwargs):
     """Add a default nlist argument based on color to get a plot with two shells of nodes."""
     try:
-        all_colors = set(vals.get('color', None) for vals in graph.nodes.values())
-        one_color = list(all_colors)[0]
-        nodes_of_one_type = [key for key, vals in graph.nodes.items()
-                             if vals.get('color', None) == one_color]
-        nodes_of_other_type = [key for key in graph.nodes if key not in nodes_of_one_type]
-        nlist = [nodes_of_one_type, nodes_of_other_type]
+        nodes_of_one_type, nodes_of_other_type = split_by_color(graph)
+        if nodes_of_one_type:
+            nlist = [nodes_of_one_type, nodes_of_other_type]
+        else:
+            nlist = [list(graph.nodes)]
     except Exception:
         nlist = [list(graph.nodes)]
     kwargs['nlist'] = kwargs.get('nlist', nlist)
     return kwargs
+
+
+def split_by_color(graph):
+    """Split the nodes into those with the color of the first node and all others in one pass."""
+    nodes_of_one_type = []
+    nodes_of_other_type = []
+    one_color = None
+    for key, vals in graph.nodes.items():
+        color = vals.get('color', None)
+        if not nodes_of_one_type:
+            one_color = color
+        if color == one_color:
+            nodes_of_one_type.append(key)
+        else:
+            nodes_of_other_type.append(key)
+    return nodes_of_one_type, nodes_of_other_type
+
+
+# Graphviz methods as a set for the membership test in calc_uncached_layout
+_GRAPHVIZ_METHOD_SET = frozenset(GRAPHVIZ_METHODS)
+
+# Deterministic methods whose coordinates are cached in memory by calc_layout
+_CACHED_METHOD_SET = frozenset(GRAPHVIZ_METHODS + ['kamada_kawai', 'spectral'])
+
+# Memory cache of layouts: key => (positions, size), least recently used first
+# - it holds graphs with at most this many nodes and edges in total
+_LAYOUT_CACHE = _OrderedDict()
+_LAYOUT_CACHE_SIZE = 0
+_LAYOUT_CACHE_MAX_SIZE = 100000
+_LAYOUT_CACHE_LOCK = _threading.Lock()
+
+# Node and edge attributes that Graphviz uses to size, shape or place nodes and edges
+_GRAPHVIZ_NODE_ATTRS = frozenset([
+    'distortion', 'fixedsize', 'fontname', 'fontsize', 'group', 'height', 'image',
+    'imagescale', 'label', 'margin', 'ordering', 'orientation', 'peripheries', 'pin', 'pos',
+    'regular', 'root', 'shape', 'sides', 'skew', 'width', 'xlabel'])
+_GRAPHVIZ_EDGE_ATTRS = frozenset([
+    'constraint', 'fontname', 'fontsize', 'headlabel', 'headport', 'label', 'len', 'lhead',
+    'ltail', 'minlen', 'samehead', 'sametail', 'taillabel', 'tailport', 'weight', 'xlabel'])
+
+# Layout function of each NetworkX or SciPy method, looked up once
+_LAYOUT_FUNCTIONS = {method: getattr(_nx.drawing.layout, method + '_layout')
+                     for method in NETWORKX_METHODS}
+_LAYOUT_FUNCTIONS['spring_lbfgs'] = spring_lbfgs_layout
+
+# Keyword arguments of spring_layout that are supported for large graphs
+_SPRING_KWARGS = {'k', 'iterations', 'threshold', 'weight', 'scale', 'seed'}
+
+# Rules for the arguments of layout, in order of its signature
+_LAYOUT_ARG_SPEC = (
+    ('data', (_nx.Graph, _nx.DiGraph, _AtomSpace, list), None, False),
+    ('method', str, LAYOUT_METHODS, False),
+    ('scale_x', (int, float), None, False),
+    ('scale_y', (int, float), None, False),
+    ('mirror_x', bool, None, False),
+    ('mirror_y', bool, None, False),
+    ('center_x', bool, None, False),
+    ('center_y', bool, None, False),
+    ('cache_dir', str, None, True),
+)
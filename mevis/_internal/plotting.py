@@ -1,3 +1,4 @@
+import threading as _threading
 from collections.abc import Callable as _Callable
 
 import gravis as _gv
@@ -6,6 +7,7 @@ from opencog.atomspace import Atom as _Atom
 from opencog.type_constructors import AtomSpace as _AtomSpace
 
 from .args import check_arg as _check_arg
+from .args import check_args as _check_args
 from .conversion import convert as _convert
 from .filtering import filter as _filter
 from .layouting import LAYOUT_METHODS as _LAYOUT_METHODS
@@ -81,7 +83,9 @@ def plot(data, backend='vis',
        to translate information such as truth values into visual properties such as
        node size, color or shape.
     3. **Layout**: Calculate x and y coordinates to better recognize structures
-       in the AtomSpace such as hierarchies and clusters.
+       in the AtomSpace such as hierarchies and clusters. This step is skipped if
+       ``layout_method`` is ``None``, e.g. to keep ``x`` and ``y`` coordinates that
+       the conversion provided with ``node_properties``.
 
     These steps are implemented by the functions
     :func:`filter`, :func:`convert` and :func:`layout`.
@@ -93,33 +97,37 @@ def plot(data, backend='vis',
     # Argument processing
     _check_arg(data, 'data', (_AtomSpace, list, _nx.Graph, _nx.DiGraph))
     _check_arg(backend, 'backend', str, ['d3', 'vis', 'three'])
-    # layout
-    _check_arg(layout_method, 'layout_method', str, _LAYOUT_METHODS, allow_none=True)
-    _check_arg(layout_scale_x, 'layout_scale_x', (int, float))
-    _check_arg(layout_scale_x, 'layout_scale_y', (int, float))
-    _check_arg(layout_mirror_x, 'layout_mirror_x', bool)
-    _check_arg(layout_mirror_y, 'layout_mirror_y', bool)
-    _check_arg(layout_center_x, 'layout_center_x', bool)
-    _check_arg(layout_center_y, 'layout_center_y', bool)
-    # filter
-    _check_arg(
-        filter_target, 'filter_target', (str, int, list, _Callable, _Atom), allow_none=True)
-    _check_arg(filter_context, 'filter_context', (str, tuple))
-    _check_arg(filter_mode, 'filter_mode', str, ['include', 'exclude'])
-    # convert: arguments have exactly the same name and thus are checked in the convert function
 
     # Preparing the graph or AtomSpace
     if isinstance(data, (_nx.Graph, _nx.DiGraph)):
+        # - a given graph is plotted as it is, so the arguments for layout, filter and
+        #   conversion are not used and need no checks
         graph = data
     else:
+        # Argument processing
+        # - layout, filter and graph: checked before any Atom is filtered or converted
+        _check_args(
+            (layout_method, layout_scale_x, layout_scale_y, layout_mirror_x, layout_mirror_y,
+             layout_center_x, layout_center_y, filter_target, filter_context, filter_mode,
+             graph_annotated, graph_directed),
+            _PLOT_ARG_SPEC)
+        # - annotations: arguments have exactly the same name and thus are checked in convert
+
         # Optional: Filtering of AtomSpace
+        # - within plot_many, the Atoms of the previous identical filtering are reused
+        cache = getattr(_REUSE, 'cache', None)
+        filter_args = (data, filter_target, filter_context, filter_mode)
         if filter_target is None:
             atoms = data
+        elif cache is None:
+            atoms = _filter(*filter_args)
         else:
-            atoms = _filter(data, filter_target, filter_context, filter_mode)
+            atoms = _reused(cache, filter_args[1:], _filter, *filter_args)
 
         # Conversion of AtomSpace to graph
-        graph = _convert(
+        # - within plot_many, the graph of the previous identical conversion is reused,
+        #   e.g. when only the backend or layout changes, and copied before a layout
+        convert_args = (
             atoms, graph_annotated, graph_directed,
             node_label, node_color, node_opacity, node_size, node_shape,
             node_border_color, node_border_size,
@@ -127,9 +135,16 @@ def plot(data, backend='vis',
             node_image, node_properties,
             edge_label, edge_color, edge_opacity, edge_size,
             edge_label_color, edge_label_size, edge_hover, edge_click)
+        if cache is None:
+            graph = _convert(*convert_args)
+        else:
+            key = (filter_args[1:], convert_args[1:])
+            graph = _reused(cache, key, _convert, *convert_args)
 
         # Optional: Layout of graph
         if layout_method is not None:
+            if cache is not None:
+                graph = graph.copy()
             graph = _layout(
                 graph, layout_method,
                 layout_scale_x, layout_scale_y, layout_mirror_x, layout_mirror_y,
@@ -148,3 +163,78 @@ def plot(data, backend='vis',
     elif backend == 'three':
         fig = _gv.three(graph, **kwargs)
     return fig
+
+
+def plot_many(data, param_dicts, **kwargs):
+    """Create several graph visualizations of the same AtomSpace, list of Atoms or graph.
+
+    This works like :func:`plot` for each of the given dicts of arguments. Consecutive
+    figures with the same filter, graph and annotation arguments share one filtering
+    and conversion, so that only layout and backend are repeated, e.g. when comparing
+    layout methods or backends. The data must therefore not change during the call,
+    e.g. by annotation functions that modify Atoms.
+
+    Parameters
+    ----------
+    data : Atomspace, list of Atoms, NetworkX Graph, NetworkX DiGraph
+        The input data that shall be visualized, see :func:`plot`.
+    param_dicts : list of dict
+        Keyword arguments of :func:`plot` for each figure.
+    kwargs
+        Keyword arguments of :func:`plot` that are used for all figures.
+        An argument given in a dict of ``param_dicts`` takes precedence.
+
+    Returns
+    -------
+    figs : list of `Figure <https://robert-haas.github.io/gravis-docs/rst/api/figure.html>`__
+        One figure for each dict in ``param_dicts``, in the same order.
+
+    """
+    # Argument processing
+    _check_arg(data, 'data', (_AtomSpace, list, _nx.Graph, _nx.DiGraph))
+    _check_arg(param_dicts, 'param_dicts', list)
+    for params in param_dicts:
+        _check_arg(params, 'params', dict)
+
+    # Plotting
+    # - intermediate results are only reused during this call and in this thread
+    outer_cache = getattr(_REUSE, 'cache', None)
+    _REUSE.cache = dict()
+    try:
+        return [plot(data, **dict(kwargs, **params)) for params in param_dicts]
+    finally:
+        _REUSE.cache = outer_cache
+
+
+def _reused(cache, key, func, *args):
+    """Call a function, or reuse its result if the previous call had the same key.
+
+    Only the last result of each function is kept, keys are compared by equality.
+
+    """
+    last = cache.get(func)
+    if last is not None and last[0] == key:
+        return last[1]
+    result = func(*args)
+    cache[func] = (key, result)
+    return result
+
+
+# Results that plot_many lets its plot calls reuse, separately for each thread
+_REUSE = _threading.local()
+
+# Rules for the layout, filter and graph arguments of plot, in order of its signature
+_PLOT_ARG_SPEC = (
+    ('layout_method', str, _LAYOUT_METHODS, True),
+    ('layout_scale_x', (int, float), None, False),
+    ('layout_scale_y', (int, float), None, False),
+    ('layout_mirror_x', bool, None, False),
+    ('layout_mirror_y', bool, None, False),
+    ('layout_center_x', bool, None, False),
+    ('layout_center_y', bool, None, False),
+    ('filter_target', (str, int, list, _Callable, _Atom), None, True),
+    ('filter_context', (str, tuple), None, False),
+    ('filter_mode', str, ['include', 'exclude'], False),
+    ('graph_annotated', bool, None, False),
+    ('graph_directed', bool, None, False),
+)
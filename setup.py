@@ -130,6 +130,11 @@ setup(
         'numpy>1.15<2',       # graph layout
         'setuptools>=40.0',   # access to package files
     ],
+
+    # Optional dependencies that are installed on request, e.g. pip install mevis[layout]
+    extras_require={
+        'layout': ['scipy'],  # spring_lbfgs layout
+    },
     
     # Entry points
     entry_points={
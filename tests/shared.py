@@ -1,5 +1,9 @@
+import importlib.util
 import inspect
 import os
+import shutil
+
+import pytest
 
 import mevis as mv
 
@@ -18,3 +22,10 @@ def load_moses_atomspace():
     filepath = os.path.join(IN_DIR, filename)
     atomspace = mv.load(filepath)
     return atomspace
+
+
+def skip_without_graphviz(program):
+    # a Graphviz layout needs the program on the PATH or pygraphviz as fallback
+    missing = shutil.which(program) is None and importlib.util.find_spec('pygraphviz') is None
+    reason = 'Graphviz program {} is not available'.format(program)
+    return pytest.mark.skipif(missing, reason=reason)
@@ -1,5 +1,8 @@
+import operator
 import os
 
+import networkx as nx
+import numpy as np
 import pytest
 
 import mevis as mv
@@ -102,6 +105,14 @@ def test_inspect():
     assert result['node_properties']['hover'] == 13
     assert result['edge_properties']['color'] == 1
 
+    # the estimated counts may deviate slightly from the exact ones
+    result = mv.inspect(graph, count_details=True, approx=True)
+    assert isinstance(result, dict)
+    assert len(result.keys()) == 4
+    assert 6 <= result['node_properties']['label'] <= 8
+    assert 12 <= result['node_properties']['hover'] <= 14
+    assert 0 <= result['edge_properties']['color'] <= 2
+
 
 def test_filter():
     atomspace = shared.load_moses_atomspace()
@@ -129,6 +140,42 @@ def test_filter():
         with pytest.raises(ValueError):
             mv.filter(atomspace, target='AndLink', context=context)
 
+    # cache of Callable targets
+    calls = []
+
+    def is_link(atom):
+        calls.append(atom)
+        return atom.is_link()
+
+    result1 = mv.filter(atomspace, is_link, cache=True)
+    num_calls = len(calls)
+    assert num_calls > 0
+    result2 = mv.filter(atomspace, is_link, cache=True)
+    assert result1 == result2
+    assert len(calls) == num_calls
+    mv.filter(atomspace, is_link, cache=False)
+    assert len(calls) == 2 * num_calls
+    mv.filter(atomspace, is_link)  # default: no cache
+    assert len(calls) == 3 * num_calls
+
+
+def test_ifilter():
+    atomspace = shared.load_moses_atomspace()
+
+    # same selection as filter
+    for mode in ['include', 'exclude']:
+        for context in ['atom', 'in', ('both', 2)]:
+            for target in ['AndLink', ['AndLink', 'NotLink']]:
+                result = mv.ifilter(atomspace, target, context, mode)
+                assert not isinstance(result, list)
+                expected = mv.filter(atomspace, target, context, mode)
+                assert set(result) == set(expected)
+
+    # chaining
+    atoms = mv.ifilter(atomspace, target='PredicateNode', mode='exclude')
+    result = mv.filter(atoms, target=lambda atom: atom.is_link())
+    assert len(result) == 9
+
 
 def test_export(tmpdir):
     atomspace = shared.load_moses_atomspace()
@@ -150,6 +197,60 @@ def test_try_scheme_eval():
     mv._internal.io._try_scheme_eval(atomspace, '(use-modules (opencog nonsense))')
 
 
+def test_convert_csr():
+    atomspace = shared.load_moses_atomspace()
+    graph = mv.convert(atomspace)
+
+    uids, indptr, indices, node_attrs, edge_attrs = mv.convert(atomspace, graph_format='csr')
+    assert len(uids) == len(set(uids)) == len(graph)
+    assert set(uids) == set(graph.nodes)
+    assert len(indptr) == len(uids) + 1
+    assert indptr[0] == 0 and indptr[-1] == len(indices) == graph.number_of_edges()
+    assert len(node_attrs) == len(uids)
+    assert len(edge_attrs) == len(indices)
+    for i, uid in enumerate(uids):
+        assert node_attrs[i] == graph.nodes[uid]
+        for k in range(indptr[i], indptr[i + 1]):
+            uid2 = uids[indices[k]]
+            assert graph.has_edge(uid, uid2)
+            assert edge_attrs[k] == graph.edges[uid, uid2]
+
+    uids, indptr, indices, node_attrs, edge_attrs = mv.convert(
+        atomspace, graph_annotated=False, graph_format='csr')
+    assert len(uids) == len(graph)
+    assert len(indices) == graph.number_of_edges()
+    assert node_attrs is None and edge_attrs is None
+
+
+def test_convert_uid_mode():
+    atomspace = shared.load_moses_atomspace()
+    for annotated in (True, False):
+        for directed in (True, False):
+            graph = mv.convert(
+                atomspace, graph_annotated=annotated, graph_directed=directed)
+            fast = mv.convert(
+                atomspace, graph_annotated=annotated, graph_directed=directed,
+                uid_mode='fast')
+            assert fast.graph == graph.graph
+            assert nx.is_isomorphic(
+                graph, fast, node_match=operator.eq, edge_match=operator.eq)
+
+
+def test_convert_unhashable_callable():
+    class TypeName:
+        # defining __eq__ without __hash__ makes instances unhashable
+        def __eq__(self, other):
+            return isinstance(other, TypeName)
+
+        def __call__(self, atom):
+            return atom.type_name
+
+    atomspace = shared.load_moses_atomspace()
+    graph = mv.convert(atomspace, node_label=TypeName(), node_color=TypeName())
+    for node, attrs in graph.nodes(data=True):
+        assert attrs['label'] == attrs['color']
+
+
 def test_layout():
     atomspace_empty = mv.create()
     atomspace_moses = shared.load_moses_atomspace()
@@ -161,3 +262,107 @@ def test_layout():
     for atomspace in [atomspace_empty, atomspace_moses]:
         for lm in known_layouts:
             mv.layout(atomspace, lm)
+
+
+def test_layout_scipy():
+    pytest.importorskip('scipy')
+    atomspace_empty = mv.create()
+    atomspace_moses = shared.load_moses_atomspace()
+
+    for atomspace in [atomspace_empty, atomspace_moses]:
+        mv.layout(atomspace, 'spring_lbfgs')
+
+    # the gradient is the derivative of the energy, also for reciprocal edges of unequal weight
+    from scipy.optimize import check_grad
+
+    from mevis._internal import layouting
+
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([(0, 1, 1.0), (1, 0, 3.0), (1, 2, 2.0), (2, 3, 0.5)])
+    nodes = list(graph)
+    csr = layouting._adjacency_csr(graph, nodes, 'weight', both_directions=True)
+    func = layouting._spring_energy_func(*csr, len(nodes), 0.5)
+    x0 = np.random.RandomState(42).rand(2 * len(nodes))
+    error = check_grad(lambda x: func(x)[0], lambda x: func(x)[1], x0)
+    assert error < 1e-4
+
+
+def test_layout_spring_large():
+    # NetworkX needs SciPy for its solver of graphs with 500 or more nodes
+    pytest.importorskip('scipy')
+    from mevis._internal import layouting
+
+    graph = nx.gnm_random_graph(600, 1200, seed=3)
+    for source, target in list(graph.edges)[:100]:
+        graph.edges[source, target]['weight'] = 2.5
+    pos = layouting.spring_layout(graph, seed=1)
+    expected = nx.spring_layout(graph, seed=1)
+    assert np.allclose([pos[node] for node in graph], [expected[node] for node in graph])
+
+    graph = mv.layout(graph, 'spring', seed=1)
+    for node, attrs in graph.nodes(data=True):
+        assert 'x' in attrs and 'y' in attrs
+
+
+@shared.skip_without_graphviz('dot')
+def test_layout_graphviz_strings():
+    graph = nx.DiGraph()
+    graph.add_node('a', label='ends with \\', hover='has "quotes"')
+    graph.add_edge('a', 'b', label='\\"')
+    graph.add_edge('b', 'b')
+    graph = mv.layout(graph, 'dot')
+    for node, attrs in graph.nodes(data=True):
+        assert 'x' in attrs and 'y' in attrs
+
+
+@shared.skip_without_graphviz('neato')
+def test_layout_center():
+    graph = mv.convert(shared.load_moses_atomspace())
+    for method in ['neato', 'kamada_kawai', 'spectral']:
+        # the cached coordinates of a deterministic layout are only shifted
+        centered = mv.layout(graph.copy(), method)
+        uncentered = mv.layout(graph.copy(), method, center_x=False, center_y=False)
+        shifts = {
+            (round(uncentered.nodes[node]['x'] - attrs['x'], 6),
+             round(uncentered.nodes[node]['y'] - attrs['y'], 6))
+            for node, attrs in centered.nodes(data=True)}
+        assert len(shifts) == 1
+
+
+@shared.skip_without_graphviz('dot')
+@shared.skip_without_graphviz('neato')
+def test_layout_cache_dir(tmpdir):
+    atomspace = shared.load_moses_atomspace()
+    cache_dir = os.path.join(str(tmpdir), 'layouts')
+    graph1 = mv.layout(atomspace, 'neato', cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    graph2 = mv.layout(atomspace, 'neato', cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    for node, attrs in graph1.nodes(data=True):
+        assert graph2.nodes[node]['x'] == attrs['x']
+        assert graph2.nodes[node]['y'] == attrs['y']
+    mv.layout(atomspace, 'dot', cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+    with pytest.raises(TypeError):
+        mv.layout(atomspace, 'dot', cache_dir=42)
+
+
+@shared.skip_without_graphviz('dot')
+@shared.skip_without_graphviz('neato')
+def test_layout_many():
+    atomspace = shared.load_moses_atomspace()
+    graph = mv.convert(atomspace)
+
+    methods = ['dot', 'neato', 'circular', 'spring']
+    for data in [atomspace, graph]:
+        graphs = mv.layout_many(data, methods)
+        assert list(graphs) == methods
+        for method in methods:
+            assert len(graphs[method]) == len(graph)
+            for node, attrs in graphs[method].nodes(data=True):
+                assert 'x' in attrs and 'y' in attrs
+    for node, attrs in graph.nodes(data=True):
+        assert 'x' not in attrs
+    assert mv.layout_many(atomspace, []) == {}
+    with pytest.raises(ValueError):
+        mv.layout_many(atomspace, ['nonsense'])
@@ -0,0 +1,32 @@
+import pytest
+
+import mevis as mv
+import shared
+
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(scope='module')
+def atomspace():
+    return shared.load_moses_atomspace()
+
+
+def is_link(atom):
+    return atom.is_link()
+
+
+def test_bench_convert(benchmark, atomspace):
+    graph = benchmark(mv.convert, atomspace)
+    assert len(graph) == atomspace.size()
+
+
+def test_bench_filter(benchmark, atomspace):
+    atoms = benchmark(mv.filter, atomspace, is_link)
+    assert len(atoms) == 9
+
+
+@shared.skip_without_graphviz('neato')
+def test_bench_plot(benchmark, atomspace):
+    fig = benchmark(mv.plot, atomspace, 'd3', 'neato')
+    assert fig.to_html()
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import mevis as mv
 import shared
@@ -12,6 +13,14 @@ def test_entrypoint():
     assert exit_status != 0
 
 
+def test_choices():
+    # the CLI repeats these values to avoid importing the heavy modules for its help
+    from mevis._internal import cli, filtering, layouting
+
+    assert cli._LAYOUT_METHODS == tuple(layouting.LAYOUT_METHODS)
+    assert cli._FILTER_CONTEXTS == tuple(filtering.FILTER_CONTEXTS)
+
+
 def test_convert_and_plot(tmpdir):
     atomspace = shared.load_moses_atomspace()
     source = 'some_atomspace.scm'
@@ -97,10 +106,14 @@ def test_layout(tmpdir):
     source = 'some_atomspace.scm'
     with tmpdir.as_cwd():
         mv.store(atomspace, source)
+        # each command is a separate process, so they can run at the same time
+        cmds = ['mevis -i {} -o test_{}.html -f -l {}'.format(source, lm, lm)
+                for lm in known_layouts]
+        with ThreadPoolExecutor(max_workers=min(len(cmds), os.cpu_count() or 1)) as executor:
+            exit_statuses = list(executor.map(os.system, cmds))
+        assert exit_statuses == [0] * len(cmds)
         for lm in known_layouts:
-            cmd = 'mevis -i {} -o test.html -f -l {}'.format(source, lm)
-            exit_status = os.system(cmd)
-            assert exit_status == 0
+            assert os.path.isfile('test_{}.html'.format(lm))
 
 
 def test_kwargs(tmpdir):
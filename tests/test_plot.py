@@ -1,3 +1,8 @@
+import itertools
+import os
+import threading
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
 from opencog.atomspace import types
 
@@ -5,80 +10,222 @@ import mevis as mv
 import shared
 
 
-def test_api():
-    atomspace = shared.load_moses_atomspace()
+DATA_VARIANTS = ['atomspace', 'atoms', 'graph']
+KNOWN_BACKENDS = ['d3', 'vis', 'three']
+GRAPHVIZ_LAYOUTS = [
+    pytest.param(method, marks=shared.skip_without_graphviz(method))
+    for method in ['dot', 'neato', 'twopi', 'circo', 'fdp', 'sfdp']]
+NETWORKX_LAYOUTS = [
+    'bipartite', 'circular', 'kamada_kawai', 'planar', 'random', 'shell', 'spring',
+    'spectral', 'spiral']
+LAYOUT_KWARGS = MappingProxyType(dict(
+    layout_scale_x=0.5,
+    layout_scale_y=0.5,
+    layout_mirror_x=True,
+    layout_mirror_y=True,
+    layout_center_x=True,
+    layout_center_y=True,
+))
+KNOWN_TARGETS = ['type_name', 'type_names', 'func', 'atom', 'atoms', 'atom_type', 'mix']
+KNOWN_CONTEXTS = ['atom', 'in', 'out', 'both', 'in-tree', 'out-tree',
+                  ('in', 2), ('out', 2), ('both', 2)]
+KNOWN_MODES = ['include', 'exclude']
+
+# Ids of all Atom types whose name starts with O, used by a callable filter target
+O_TYPES = frozenset(
+    value for name, value in vars(types).items()
+    if name.startswith('O') and isinstance(value, int))
+
+# Filter arguments: every pair of values from two axes occurs at least once
+# - each target-context pair gets one mode, which alternates along both axes, so every
+#   target and every context is also combined with each mode (needs at most 9 modes)
+# - MEVIS_FULL_MATRIX=1 in the environment tests the full product instead
+if os.environ.get('MEVIS_FULL_MATRIX'):
+    FILTER_ARGS = list(itertools.product(KNOWN_TARGETS, KNOWN_CONTEXTS, KNOWN_MODES))
+else:
+    FILTER_ARGS = [
+        (ft, fc, KNOWN_MODES[(i + j) % len(KNOWN_MODES)])
+        for i, ft in enumerate(KNOWN_TARGETS)
+        for j, fc in enumerate(KNOWN_CONTEXTS)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_reuse_cache(monkeypatch):
+    # Results reused by plot_many never leak from one test into another
+    monkeypatch.setattr(mv._internal.plotting, '_REUSE', threading.local())
+
+
+@pytest.fixture(autouse=True)
+def skip_rendering(request, monkeypatch):
+    # Most tests only check that plot accepts or rejects arguments, so the HTML of the
+    # figure is not generated unless a test is marked with render
+    if request.node.get_closest_marker('render') is None:
+        def no_figure(graph, **kwargs):
+            return graph
+
+        backends = SimpleNamespace(d3=no_figure, vis=no_figure, three=no_figure)
+        monkeypatch.setattr(mv._internal.plotting, '_gv', backends)
+
+
+@pytest.fixture(scope='module')
+def atomspace():
+    return shared.load_moses_atomspace()
+
+
+@pytest.fixture(scope='module')
+def atoms(atomspace):
+    # only the first six Atoms are used as data or filter targets
+    return list(itertools.islice(atomspace, 6))
+
+
+@pytest.fixture(scope='module')
+def graph(atomspace):
+    return mv.convert(atomspace)
+
+
+@pytest.fixture(scope='module')
+def targets(atoms):
+    atom = atoms[5]
+    return {
+        'type_name': 'OrLink',
+        'type_names': ['NotLink', 'OrLink'],
+        'func': starts_with_o,
+        'atom': atom,
+        'atoms': atoms[3:5],
+        'atom_type': types.AndLink,
+        'mix': ['OrLink', atom],
+    }
 
-    # Plot
-    # - default
-    data_variants = (
-        atomspace,              # AtomSpace
-        list(atomspace)[0:5],   # list of Atoms
-        mv.convert(atomspace),  # graph
-    )
-    for data in data_variants:
-        mv.plot(data)
 
-    # - backend
-    for backend in ('d3', 'vis', 'three'):
-        mv.plot(atomspace, backend)
-    with pytest.raises(TypeError):
+def starts_with_o(atom):
+    return int(atom.type) in O_TYPES
+
+
+@pytest.mark.parametrize('data_variant', DATA_VARIANTS)
+def test_plot_data(atomspace, atoms, graph, data_variant):
+    data = dict(
+        atomspace=atomspace,  # AtomSpace
+        atoms=atoms[0:5],     # list of Atoms
+        graph=graph,          # graph
+    )[data_variant]
+    mv.plot(data)
+
+
+@pytest.mark.render
+@pytest.mark.parametrize('backend', KNOWN_BACKENDS)
+def test_plot_backend(graph, backend):
+    fig = mv.plot(graph, backend)
+    assert fig.to_html()
+
+
+def test_plot_backend_invalid(atomspace):
+    with pytest.raises(TypeError, match='"backend" has a wrong type'):
         mv.plot(atomspace, 42)
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match='"backend" has a wrong value'):
         mv.plot(atomspace, 'nonsense')
 
-    # - layout parameters
-    other = dict(
-        layout_scale_x=0.5,
-        layout_scale_y=0.5,
-        layout_mirror_x=True,
-        layout_mirror_y=True,
-        layout_center_x=True,
-        layout_center_y=True,
-    )
-    known_layouts = [
-        'dot', 'neato', 'twopi', 'circo', 'fdp', 'sfdp',
-        'bipartite', 'circular', 'kamada_kawai', 'planar', 'random', 'shell', 'spring',
-        'spectral', 'spiral']
-    for lm in known_layouts:
-        mv.plot(atomspace, 'vis', lm, **other)
-    for cx in (True, False):
-        for cy in (True, False):
-            mv.plot(atomspace, 'd3', 'neato', layout_center_x=cx, layout_center_y=cy)
-    with pytest.raises(TypeError):
-        mv.plot(atomspace, 'vis', 42, **other)
-    with pytest.raises(ValueError):
-        mv.plot(atomspace, 'vis', 'nonsense', **other)
-
-    # - filter parameters
-    type_name = 'OrLink'
-    type_names = ['NotLink', 'OrLink']
-    atom = list(atomspace)[5]
-    atoms = list(atomspace)[3:5]
-    atom_type = types.AndLink
-    mix = [type_name, atom]
-
-    def func(atom):
-        return atom.type_name.startswith('O')
-
-    known_targets = [type_name, type_names, type_names, func, atom, atoms, atom_type, mix]
-    known_contexts = ['atom', 'in', 'out', 'both', 'in-tree', 'out-tree',
-                      ('in', 2), ('out', 2), ('both', 2)]
-    known_modes = ['include', 'exclude']
-    for ft in known_targets:
-        for fc in known_contexts:
-            for fm in known_modes:
-                mv.plot(atomspace, filter_target=ft, filter_context=fc, filter_mode=fm)
-
-    # - annotated
-    for annotated in (True, False):
-        mv.plot(atomspace, graph_annotated=annotated)
-
-    # - directed
-    for directed in (True, False):
-        mv.plot(atomspace, graph_directed=directed)
-
-    # - annotation parameters
-    mv.plot(
+
+@pytest.mark.parametrize('layout_method', GRAPHVIZ_LAYOUTS)
+def test_plot_layout_graphviz(atomspace, layout_method):
+    mv.plot(atomspace, 'vis', layout_method, **LAYOUT_KWARGS)
+
+
+@pytest.mark.parametrize('layout_method', NETWORKX_LAYOUTS)
+def test_plot_layout_networkx(atomspace, layout_method):
+    mv.plot(atomspace, 'vis', layout_method, **LAYOUT_KWARGS)
+
+
+@shared.skip_without_graphviz('neato')
+@pytest.mark.parametrize('center_x', (True, False))
+@pytest.mark.parametrize('center_y', (True, False))
+def test_plot_layout_center(atomspace, center_x, center_y):
+    mv.plot(atomspace, 'd3', 'neato', layout_center_x=center_x, layout_center_y=center_y)
+
+
+def test_plot_layout_given_coordinates(atomspace):
+    # without rendering, plot returns the graph that it would pass to the backend
+    properties = dict(x=1.0, y=2.0)
+    graph = mv.plot(atomspace, 'vis', None, node_properties=properties)
+    assert all(attrs['x'] == 1.0 and attrs['y'] == 2.0 for attrs in graph.nodes.values())
+
+    # an explicit layout method replaces the given coordinates
+    graph = mv.plot(atomspace, 'vis', 'circular', node_properties=properties)
+    assert not all(attrs['x'] == 1.0 and attrs['y'] == 2.0 for attrs in graph.nodes.values())
+
+
+def test_plot_layout_invalid(atomspace):
+    with pytest.raises(TypeError, match='"layout_method" has a wrong type'):
+        mv.plot(atomspace, 'vis', 42, **LAYOUT_KWARGS)
+    with pytest.raises(ValueError, match='"layout_method" has a wrong value'):
+        mv.plot(atomspace, 'vis', 'nonsense', **LAYOUT_KWARGS)
+
+
+@pytest.mark.parametrize('filter_target, filter_context, filter_mode', FILTER_ARGS)
+def test_plot_filter(atomspace, targets, filter_target, filter_context, filter_mode):
+    mv.plot(atomspace, filter_target=targets[filter_target], filter_context=filter_context,
+            filter_mode=filter_mode)
+
+
+def test_plot_filter_reuse(atomspace, monkeypatch):
+    calls = []
+    filter_func = mv._internal.plotting._filter
+
+    def counted_filter(*args):
+        calls.append(args)
+        return filter_func(*args)
+
+    monkeypatch.setattr(mv._internal.plotting, '_filter', counted_filter)
+    # plot_many reuses the Atoms of an identical filtering
+    param_dicts = [dict(backend=backend) for backend in KNOWN_BACKENDS]
+    mv.plot_many(atomspace, param_dicts, filter_target=['NotLink', 'OrLink'], filter_context='in')
+    assert len(calls) == 1
+    param_dicts.append(dict(filter_context='out'))
+    mv.plot_many(atomspace, param_dicts, filter_target=['NotLink', 'OrLink'], filter_context='in')
+    assert len(calls) == 3
+    # plot filters on every call, because the data may have changed in between
+    for _ in range(2):
+        mv.plot(atomspace, filter_target=['NotLink', 'OrLink'], filter_context='in')
+    assert len(calls) == 5
+
+
+def test_plot_graph_invalid(atomspace, monkeypatch):
+    # invalid arguments are reported before any Atom is filtered
+    monkeypatch.setattr(mv._internal.plotting, '_filter', None)
+    with pytest.raises(TypeError, match='"graph_annotated" has a wrong type'):
+        mv.plot(atomspace, filter_target='OrLink', graph_annotated='yes')
+    with pytest.raises(TypeError, match='"graph_directed" has a wrong type'):
+        mv.plot(atomspace, filter_target='OrLink', graph_directed=1)
+
+
+@pytest.mark.parametrize('annotated', (True, False))
+def test_plot_annotated(atomspace, annotated):
+    mv.plot(atomspace, graph_annotated=annotated)
+
+
+@pytest.mark.parametrize('directed', (True, False))
+def test_plot_directed(atomspace, directed):
+    mv.plot(atomspace, graph_directed=directed)
+
+
+def test_plot_many(atomspace, graph):
+    param_dicts = [dict(backend=backend) for backend in KNOWN_BACKENDS]
+    for data in (atomspace, graph):
+        figs = mv.plot_many(data, param_dicts, layout_method='circular')
+        assert len(figs) == len(param_dicts)
+    param_dicts = [
+        dict(filter_target=ft, filter_context=fc, filter_mode=fm) for ft, fc, fm in [
+            ('OrLink', 'in', 'include'), (['NotLink', 'OrLink'], ('both', 2), 'exclude')]]
+    assert len(mv.plot_many(atomspace, param_dicts)) == 2
+    assert mv.plot_many(atomspace, []) == []
+    with pytest.raises(TypeError, match='"params" has a wrong type'):
+        mv.plot_many(atomspace, [42])
+    with pytest.raises(ValueError, match='"backend" has a wrong value'):
+        mv.plot_many(atomspace, [dict(backend='nonsense')])
+
+
+@pytest.mark.render
+def test_plot_annotation(atomspace):
+    fig = mv.plot(
         atomspace,
         backend='d3',
         layout_method='neato',
@@ -115,22 +262,49 @@ def test_api():
         edge_hover='e',
         edge_click='f',
     )
+    assert fig.to_html()
 
-    def to_node_shape(atom):
-        return 'circle' if atom.is_link() else 'hexagon'
-
-    def to_edge_color(atom1, atom2):
-        return 'pink' if atom1.is_link() and atom2.is_link() else None
 
-    mv.plot(
+@pytest.mark.render
+def test_plot_annotation_callbacks(atomspace):
+    fig = mv.plot(
         atomspace,
-        node_label=lambda atom: atom.type_name if atom.is_link() else atom.type_name + atom.name,
-        node_color=lambda atom: 'blue' if atom.is_link() else 'green',
+        node_label=to_node_label,
+        node_color=to_node_color,
         node_shape=to_node_shape,
-        node_size=lambda atom: 10 if atom.is_node() else 20,
+        node_size=to_node_size,
         node_hover=None,
         node_properties='tv',
-        edge_label=lambda atom1, atom2: '{}-{}'.format(atom1.type_name, atom2.type_name),
+        edge_label=to_edge_label,
         edge_color=to_edge_color,
-        edge_size=lambda atom1, atom2: None if atom1.is_link() and atom2.is_link() else 3,
+        edge_size=to_edge_size,
     )
+    assert fig.to_html()
+
+
+def to_node_label(atom):
+    return atom.type_name if atom.is_link() else atom.type_name + atom.name
+
+
+def to_node_color(atom):
+    return 'blue' if atom.is_link() else 'green'
+
+
+def to_node_shape(atom):
+    return 'circle' if atom.is_link() else 'hexagon'
+
+
+def to_node_size(atom):
+    return 10 if atom.is_node() else 20
+
+
+def to_edge_label(atom1, atom2):
+    return '{}-{}'.format(atom1.type_name, atom2.type_name)
+
+
+def to_edge_color(atom1, atom2):
+    return 'pink' if atom1.is_link() and atom2.is_link() else None
+
+
+def to_edge_size(atom1, atom2):
+    return None if atom1.is_link() and atom2.is_link() else 3